@@ -1,16 +1,25 @@
+import asyncio
+import hashlib
+import json
 import logging
-import mimetypes
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
 from pathlib import Path
+from typing import FrozenSet, Optional
 
-from fastapi import Depends, FastAPI
+from fastapi import APIRouter, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from starlette.responses import Response
+from starlette.types import Scope
+from sqlalchemy import text
 
 from api.common.config import get_settings, init_config, Settings
-from api.common.middleware import ErrorHandlingMiddleware, LoggingMiddleware
+from api.common.middleware import ErrorHandlingMiddleware, FastNotFoundMiddleware, LoggingMiddleware
 from api.routes import (
     business_glossary_routes,
     catalog_commander_routes,
@@ -35,7 +44,7 @@ from api.common.database import init_db, get_session_factory, SQLAlchemySession
 from api.controller.data_products_manager import DataProductsManager
 from api.controller.data_asset_reviews_manager import DataAssetReviewManager
 from databricks.sdk import WorkspaceClient
-from api.common.workspace_client import get_workspace_client
+from api.common.workspace_client import get_sql_connection, get_workspace_client
 from api.controller.notifications_manager import NotificationsManager
 
 # Initialize configuration and logging first
@@ -44,8 +53,8 @@ settings = get_settings()
 setup_logging(level=settings.LOG_LEVEL, log_file=settings.LOG_FILE)
 logger = get_logger(__name__)
 
-logger.info(f"Starting application in {settings.ENV} mode.")
-logger.info(f"Debug mode: {settings.DEBUG}")
+logger.info("Starting application in %s mode.", settings.ENV)
+logger.info("Debug mode: %s", settings.DEBUG)
 
 # --- Helper Functions (Define BEFORE App Instantiation) ---
 
@@ -109,22 +118,8 @@ def load_demo_data(db_session: SQLAlchemySession, settings: Settings):
 
 # --- Application Lifecycle Events ---
 
-# Application Startup Event
-async def startup_event():
-    logger.info("Running application startup event...")
-    
-    # 1. Initialize database connection, create catalog/schema, and apply migrations
-    try:
-        init_db() 
-        logger.info("Database initialization complete.")
-    except ConnectionError as e:
-         logger.critical(f"Database connection/initialization failed on startup: {e}", exc_info=True)
-         raise RuntimeError("Application cannot start without database connection.") from e
-    except Exception as e:
-         logger.critical(f"An unexpected error occurred during startup database initialization: {e}", exc_info=True)
-         raise RuntimeError("Application cannot start due to database initialization error.") from e
-
-    # 2. Load Demo Data (conditionally)
+def _run_demo_load() -> None:
+    """Creates a DB session and loads demo data; runs in a worker thread."""
     db_session = None 
     try:
         # Get the factory *after* init_db has run
@@ -148,10 +143,101 @@ async def startup_event():
             db_session.close()
             logger.info("Demo data DB session closed.")
 
+def _warmup_workspace_client() -> None:
+    """Builds the workspace client up front so its auth config is resolved before the first request."""
+    try:
+        get_workspace_client()
+        logger.info("Workspace client warmed up.")
+    except Exception as e:
+        logger.warning("Workspace client warmup failed: %s", e)
+
+def _prime_tables_cache() -> None:
+    """Fills every tables.list cache entry from one SQL warehouse query."""
+    try:
+        with contextmanager(get_sql_connection)() as sql_conn:
+            count = get_workspace_client().prime_tables_cache(sql_conn)
+        logger.info("Primed table listings for %s schemas.", count)
+    except Exception as e:
+        logger.warning("Table listing priming failed: %s", e)
+
+async def _prefetch_workspace_metadata() -> None:
+    """Populates the workspace client's list caches before the first request.
+
+    The cached calls store their results as a side effect, so the results
+    are discarded here.
+    """
+    # Table listings first, in one query, before the per-catalog REST calls
+    if get_settings().DATABRICKS_HTTP_PATH:
+        await asyncio.to_thread(_prime_tables_cache)
+
+    try:
+        ws = get_workspace_client()
+        _, _, catalogs = await asyncio.gather(
+            asyncio.to_thread(ws.clusters.list),
+            asyncio.to_thread(ws.connections.list),
+            asyncio.to_thread(ws.catalogs.list),
+        )
+
+        # Schemas are listed per catalog; overlap those calls too
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=16, thread_name_prefix="ws-prefetch") as executor:
+            await asyncio.gather(*(
+                loop.run_in_executor(executor, ws.schemas.list, catalog.name)
+                for catalog in catalogs
+            ))
+        logger.info("Prefetched workspace metadata for %s catalogs.", len(catalogs))
+    except Exception as e:
+        logger.warning("Workspace metadata prefetch failed: %s", e)
+
+def _warmup_db_pool() -> None:
+    """Opens a pooled DB connection so the first requests don't race to connect."""
+    db_session = None
+    try:
+        db_session = get_session_factory()()
+        db_session.execute(text("SELECT 1"))
+        logger.info("Database connection pool warmed up.")
+    except Exception as e:
+        logger.warning("Database connection pool warmup failed: %s", e)
+    finally:
+        if db_session:
+            db_session.close()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logger.info("Running application startup event...")
+    
+    # 1. Initialize database connection, create catalog/schema, and apply migrations.
+    #    Independent init steps do blocking network I/O, so run them concurrently
+    #    in worker threads instead of one after the other on the event loop.
+    try:
+        await asyncio.gather(
+            asyncio.to_thread(init_db),
+            asyncio.to_thread(_warmup_workspace_client),
+        )
+        logger.info("Database initialization complete.")
+    except ConnectionError as e:
+         logger.critical("Database connection/initialization failed on startup: %s", e, exc_info=True)
+         raise RuntimeError("Application cannot start without database connection.") from e
+    except Exception as e:
+         logger.critical("An unexpected error occurred during startup database initialization: %s", e, exc_info=True)
+         raise RuntimeError("Application cannot start due to database initialization error.") from e
+
+    # 2. Open a pooled connection before serving the first request
+    await asyncio.to_thread(_warmup_db_pool)
+
+    # 3. Load Demo Data (conditionally) in the background so the server
+    #    starts accepting requests right away
+    app.state.demo_task = asyncio.create_task(asyncio.to_thread(_run_demo_load))
+
+    # 4. Fill the workspace metadata caches in the background
+    app.state.prefetch_task = asyncio.create_task(_prefetch_workspace_metadata())
+
+    # 5. Refresh the cached SPA index (the frontend may have been rebuilt since import)
+    _load_index_html()
+
     logger.info("Application startup complete.")
+    yield
 
-# Application Shutdown Event
-async def shutdown_event():
     logger.info("Running application shutdown event...")
     logger.info("Application shutdown complete.")
 
@@ -159,72 +245,123 @@ async def shutdown_event():
 
 # Define paths
 STATIC_ASSETS_PATH = Path(__file__).parent.parent / "static"
-logger.info(f"STATIC_ASSETS_PATH: {STATIC_ASSETS_PATH}")
+STATIC_ASSETS_PATH_STR = str(STATIC_ASSETS_PATH.resolve())
+logger.info("STATIC_ASSETS_PATH: %s", STATIC_ASSETS_PATH_STR)
 
-# mimetypes.add_type('application/javascript', '.js')
-# mimetypes.add_type('image/svg+xml', '.svg')
-# mimetypes.add_type('image/png', '.png')
+# The SPA index is served for every unmatched route, so keep it in memory
+# instead of re-reading it from disk on each request.
+_SPA_INDEX = STATIC_ASSETS_PATH / "index.html"
+_NON_SPA_PREFIXES = ("api/", "static/")
+_INDEX_HTML: Optional[bytes] = None
+_INDEX_ETAG: Optional[str] = None
 
-# Create single FastAPI app with settings dependency
+def _load_index_html() -> None:
+    """Reads the SPA index.html into the in-memory buffer, if it exists."""
+    global _INDEX_HTML, _INDEX_ETAG
+    _INDEX_HTML = _SPA_INDEX.read_bytes() if _SPA_INDEX.is_file() else None
+    _INDEX_ETAG = f'"{hashlib.md5(_INDEX_HTML).hexdigest()}"' if _INDEX_HTML is not None else None
+
+_load_index_html()
+
+# Vite lists the fingerprinted files of a build in its manifest; files copied
+# from public/ keep their names across builds and are not in it
+_VITE_MANIFEST = STATIC_ASSETS_PATH / ".vite" / "manifest.json"
+
+def _load_hashed_assets() -> FrozenSet[str]:
+    """Returns the build's fingerprinted file names, relative to the static dir."""
+    try:
+        manifest = json.loads(_VITE_MANIFEST.read_bytes())
+    except (OSError, ValueError):
+        return frozenset()
+    files = set()
+    for chunk in manifest.values():
+        files.add(chunk["file"])
+        files.update(chunk.get("css", ()))
+        files.update(chunk.get("assets", ()))
+    return frozenset(files)
+
+_HASHED_ASSETS = _load_hashed_assets()
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that adds Cache-Control headers to served assets.
+
+    Fingerprinted build assets never change under the same name, so they are
+    cached for a year; everything else must be revalidated after 5 minutes.
+    """
+
+    def file_response(
+        self,
+        full_path: "str | os.PathLike[str]",
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        relative = Path(os.path.relpath(full_path, STATIC_ASSETS_PATH_STR)).as_posix()
+        if relative in _HASHED_ASSETS:
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            response.headers["Cache-Control"] = "max-age=300, must-revalidate"
+        return response
+
+# Create single FastAPI app
 app = FastAPI(
     title="Unity Catalog Swiss Army Knife",
     description="A Databricks App for managing data products, contracts, and more",
     version="1.0.0",
-    dependencies=[Depends(get_settings)],
-    on_startup=[startup_event],
-    on_shutdown=[shutdown_event]
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
-# Configure CORS
-origins = [
-    "http://localhost:3000",
-    "http://localhost:8000",
-    "http://localhost:8001",
-    "http://localhost:5173",
-    "http://localhost:5174",
-    "http://localhost:5175",
-    "http://0.0.0.0:5173",
-    "http://0.0.0.0:5174",
-    "http://0.0.0.0:5175",
-]
+# Configure CORS for the local dev servers (React/Vite and the API itself)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=origins,
+    allow_origin_regex=r"^http://(localhost:(3000|8000|8001|5173|5174|5175)|0\.0\.0\.0:(5173|5174|5175))$",
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
+    allow_headers=["content-type", "authorization"],
+    max_age=86400,  # Let browsers cache preflight responses for 24 hours
 )
 
+# Compress JSON and HTML responses (wraps CORS, sits inside logging)
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=5)
+
 # Add custom middleware
 app.add_middleware(LoggingMiddleware)
 app.add_middleware(ErrorHandlingMiddleware)
+# Added last so it is outermost and turns away stray file requests first
+app.add_middleware(FastNotFoundMiddleware)
 
 # Mount static files for the React application
-app.mount("/static", StaticFiles(directory=STATIC_ASSETS_PATH, html=True), name="static")
-
-# Register data asset reviews FIRST for diagnostics
-data_asset_reviews_routes.register_routes(app)
-
-# Register routes from each module
-# Data Management features
-data_product_routes.register_routes(app)
-data_contract_routes.register_routes(app)
-business_glossary_routes.register_routes(app)
-master_data_management_routes.register_routes(app)
-compliance_routes.register_routes(app)
-estate_manager_routes.register_routes(app)
-# Security features
-security_features_routes.register_routes(app)
-entitlements_routes.register_routes(app)
-entitlements_sync_routes.register_routes(app)
-# Tools features
-catalog_commander_routes.register_routes(app)
-# Auxiliary services
-metadata_routes.register_routes(app)
-notifications_routes.register_routes(app)
-search_routes.register_routes(app)
-settings_routes.register_routes(app)
-user_routes.register_routes(app)
+app.mount("/static", CachedStaticFiles(directory=STATIC_ASSETS_PATH_STR, html=True), name="static")
+
+# Register routes from each module onto a single router and include it once
+# (data asset reviews FIRST for diagnostics)
+main_router = APIRouter()
+for routes_module in (
+    data_asset_reviews_routes,
+    # Data Management features
+    data_product_routes,
+    data_contract_routes,
+    business_glossary_routes,
+    master_data_management_routes,
+    compliance_routes,
+    estate_manager_routes,
+    # Security features
+    security_features_routes,
+    entitlements_routes,
+    entitlements_sync_routes,
+    # Tools features
+    catalog_commander_routes,
+    # Auxiliary services
+    metadata_routes,
+    notifications_routes,
+    search_routes,
+    settings_routes,
+    user_routes,
+):
+    routes_module.register_routes(main_router)
+app.include_router(main_router)
 
 # Define other specific API routes BEFORE the catch-all
 @app.get("/api/time")
@@ -234,22 +371,33 @@ async def get_current_time():
 
 # Define the SPA catch-all route LAST
 @app.get("/{full_path:path}")
-def serve_spa(full_path: str):
-    # Only catch routes that aren't API routes or static files
-    # This check might be redundant now due to ordering, but safe to keep
-    if not full_path.startswith("api/") and not full_path.startswith("static/"):
-        # Ensure the path exists before serving
-        spa_index = STATIC_ASSETS_PATH / "index.html"
-        if spa_index.is_file():
-           return FileResponse(spa_index, media_type="text/html")
-        else:
-           # Optional: Return a 404 or a simple HTML message if index.html is missing
-           logger.error(f"SPA index.html not found at {spa_index}")
-           return HTMLResponse(content="<html><body>Frontend not built or index.html missing.</body></html>", status_code=404)
-    # If it starts with api/ or static/ but wasn't handled by a router/StaticFiles,
-    # FastAPI will return its default 404 Not Found, which is correct.
-    # No explicit return needed here for that case.
+def serve_spa(full_path: str, request: Request):
+    # Only catch routes that aren't API routes or static files; anything under
+    # api/ or static/ that reached this point has no handler
+    if full_path.startswith(_NON_SPA_PREFIXES):
+        raise HTTPException(status_code=404, detail="Not Found")
+    # Serve the cached index.html loaded at startup
+    if _INDEX_HTML is not None:
+        # Let browsers revalidate cheaply against the precomputed ETag
+        if request.headers.get("if-none-match") == _INDEX_ETAG:
+            return Response(status_code=304, headers={"ETag": _INDEX_ETAG})
+        return Response(
+            content=_INDEX_HTML,
+            media_type="text/html",
+            headers={"ETag": _INDEX_ETAG, "Cache-Control": "no-cache"},
+        )
+    # Optional: Return a 404 or a simple HTML message if index.html is missing
+    logger.error(f"SPA index.html not found at {_SPA_INDEX}")
+    return HTMLResponse(content="<html><body>Frontend not built or index.html missing.</body></html>", status_code=404)
 
 if __name__ == '__main__':
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, debug=True)
+    uvicorn.run(
+        "api.app:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=(os.cpu_count() or 1) * 2 + 1,
+        log_level="info",
+    )
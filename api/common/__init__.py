@@ -23,13 +23,32 @@ from .deps import (
     get_user_id,
     require_user_id,
 )
-from .git import GitService, get_git_service
-from .job_runner import JobRunner, get_job_runner
 from .logging import get_logger
-from .middleware import ErrorHandlingMiddleware, LoggingMiddleware
-from .notifications import NotificationService, get_notification_service
-from .search import SearchService, get_search_service
-from .workspace_client import CachingWorkspaceClient, get_workspace_client
+from .middleware import ErrorHandlingMiddleware, FastNotFoundMiddleware, LoggingMiddleware
+
+# Heavier service modules are resolved on first attribute access
+_LAZY_EXPORTS = {
+    'GitService': 'git',
+    'get_git_service': 'git',
+    'JobRunner': 'job_runner',
+    'get_job_runner': 'job_runner',
+    'NotificationService': 'notifications',
+    'get_notification_service': 'notifications',
+    'SearchService': 'search',
+    'get_search_service': 'search',
+    'CachingWorkspaceClient': 'workspace_client',
+    'get_workspace_client': 'workspace_client',
+    'get_sql_connection': 'workspace_client',
+}
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     "ConfigManager",
@@ -55,6 +74,7 @@ __all__ = [
     'require_user_id',
     'LoggingMiddleware',
     'ErrorHandlingMiddleware',
+    'FastNotFoundMiddleware',
     'CachingWorkspaceClient',
     'get_workspace_client',
     'get_sql_connection'
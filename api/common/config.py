@@ -1,14 +1,17 @@
 from __future__ import annotations
 
+import json
+import os
+from dataclasses import MISSING, dataclass, field, fields
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 
 import yaml
-from pydantic import Field, field_validator
-from pydantic_settings import BaseSettings
-from pydantic import model_validator
+from dotenv import load_dotenv
 
+from . import yaml_io
 from .logging import get_logger
 
 logger = get_logger(__name__)
@@ -16,11 +19,24 @@ logger = get_logger(__name__)
 # Define paths
 DOTENV_FILE = Path(__file__).parent.parent.parent / Path(".env")
 
-class Settings(BaseSettings):
-    """Application settings."""
+_TRUE_VALUES = frozenset(('1', 'true', 't', 'yes', 'y', 'on'))
+_FALSE_VALUES = frozenset(('0', 'false', 'f', 'no', 'n', 'off', ''))
 
-    # Database settings
-    DATABASE_URL: Optional[str] = Field(None, env='DATABASE_URL')
+def _as_bool(value: str) -> bool:
+    """Parse a boolean environment value such as ``true``, ``1`` or ``off``."""
+    normalized = value.strip().lower()
+    if normalized in _TRUE_VALUES:
+        return True
+    if normalized in _FALSE_VALUES:
+        return False
+    raise ValueError(f"Invalid boolean value: {value!r}")
+
+@dataclass(slots=True)
+class Settings:
+    """Application settings.
+
+    Not frozen: SettingsManager updates the job settings in place.
+    """
 
     # Databricks connection settings
     DATABRICKS_HOST: str
@@ -28,43 +44,80 @@ class Settings(BaseSettings):
     DATABRICKS_CATALOG: str
     DATABRICKS_SCHEMA: str
     DATABRICKS_VOLUME: str
-    DATABRICKS_TOKEN: Optional[str] = None  # Optional since handled by SDK
-    DATABRICKS_HTTP_PATH: Optional[str] = None # Will be computed by validator
+    DATABRICKS_TOKEN: Optional[str] = field(default=None, repr=False)  # Optional since handled by SDK
+    DATABRICKS_HTTP_PATH: Optional[str] = None  # Computed in __post_init__
+    DBSQL_POOL_SIZE: int = 4  # Pooled Databricks SQL connections
+
+    # Database settings
+    DATABASE_URL: Optional[str] = None
 
     # Environment
     ENV: str = "PROD"  # LOCAL, DEV, PROD
 
     # Application settings
-    DEBUG: bool = Field(False, env='DEBUG')
-    LOG_LEVEL: str = Field('INFO', env='LOG_LEVEL')
-    LOG_FILE: Optional[str] = Field(None, env='LOG_FILE')
+    DEBUG: bool = False
+    LOG_LEVEL: str = 'INFO'
+    LOG_FILE: Optional[str] = None
 
     # Git settings for YAML storage
-    GIT_REPO_URL: Optional[str] = Field(None, env='GIT_REPO_URL')
-    GIT_BRANCH: str = Field('main', env='GIT_BRANCH')
-    GIT_USERNAME: Optional[str] = Field(None, env='GIT_USERNAME')
-    GIT_PASSWORD: Optional[str] = Field(None, env='GIT_PASSWORD')
+    GIT_REPO_URL: Optional[str] = None
+    GIT_BRANCH: str = 'main'
+    GIT_USERNAME: Optional[str] = None
+    GIT_PASSWORD: Optional[str] = field(default=None, repr=False)
+    GIT_CACHE_TTL: int = 300  # Seconds a fetched clone is considered fresh
+    GIT_COMMIT_INTERVAL: float = 0.5  # Seconds to batch saves into one commit
 
     # Job settings
     job_cluster_id: Optional[str] = None
     sync_enabled: bool = False
     sync_repository: Optional[str] = None
-    enabled_jobs: List[str] = Field(default_factory=list)
+    enabled_jobs: List[str] = field(default_factory=list)
     updated_at: Optional[datetime] = None
 
     # Demo Mode Flag
-    APP_DEMO_MODE: bool = Field(False, env='APP_DEMO_MODE')
-
-    class Config:
-        env_file = DOTENV_FILE
-        case_sensitive = True
+    APP_DEMO_MODE: bool = False
 
-    @model_validator(mode='after')
-    def compute_databricks_http_path(self) -> 'Settings':
-        """Compute the DATABRICKS_HTTP_PATH after validation."""
+    def __post_init__(self) -> None:
+        """Compute the DATABRICKS_HTTP_PATH from the warehouse ID."""
         if self.DATABRICKS_WAREHOUSE_ID:
             self.DATABRICKS_HTTP_PATH = f"/sql/1.0/warehouses/{self.DATABRICKS_WAREHOUSE_ID}"
-        return self
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> Settings:
+        """Build settings from environment variables.
+
+        Variable names match the field names exactly (case-sensitive).
+
+        Args:
+            environ: Mapping to read from, defaults to os.environ
+
+        Returns:
+            Application settings
+
+        Raises:
+            ValueError: If a required variable is missing or a value cannot
+                be converted to the field's type
+        """
+        if environ is None:
+            environ = os.environ
+
+        values: Dict[str, Any] = {}
+        missing = []
+        for f in fields(cls):
+            raw = environ.get(f.name)
+            if raw is None:
+                if f.default is MISSING and f.default_factory is MISSING:
+                    missing.append(f.name)
+                continue
+            cast = _FIELD_CASTS.get(f.name)
+            try:
+                values[f.name] = cast(raw) if cast else raw
+            except ValueError as e:
+                raise ValueError(f"Invalid value for {f.name}: {e!s}") from e
+
+        if missing:
+            raise ValueError(f"Missing required settings: {', '.join(missing)}")
+        return cls(**values)
 
     def to_dict(self):
         return {
@@ -75,6 +128,18 @@ class Settings(BaseSettings):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+# Conversions for non-string fields; everything else is kept as-is
+_FIELD_CASTS: Dict[str, Callable[[str], Any]] = {
+    'DEBUG': _as_bool,
+    'sync_enabled': _as_bool,
+    'APP_DEMO_MODE': _as_bool,
+    'DBSQL_POOL_SIZE': int,
+    'GIT_CACHE_TTL': int,
+    'GIT_COMMIT_INTERVAL': float,
+    'enabled_jobs': json.loads,
+    'updated_at': datetime.fromisoformat,
+}
+
 class ConfigManager:
     """Manages application configuration and YAML files."""
 
@@ -87,6 +152,9 @@ class ConfigManager:
         self.settings = settings
         self.data_dir = Path('api/data')
         self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.data_dir_str = str(self.data_dir)
+        # Parsed YAML keyed by file path, invalidated by modification time
+        self._cache: Dict[str, Tuple[int, Any]] = {}
 
     def load_yaml(self, filename: str) -> Dict[str, Any]:
         """Load a YAML file from the data directory.
@@ -95,23 +163,38 @@ class ConfigManager:
             filename: Name of the YAML file
             
         Returns:
-            Dictionary containing the YAML data
+            Dictionary containing the YAML data. Repeated calls return the
+            same cached object until the file changes on disk.
             
         Raises:
             FileNotFoundError: If the file doesn't exist
             yaml.YAMLError: If the file contains invalid YAML
         """
-        file_path = self.data_dir / filename
-        if not file_path.exists():
+        file_path = os.path.join(self.data_dir_str, filename)
+        # A single stat both checks existence and validates the cache
+        try:
+            mtime_ns = os.stat(file_path).st_mtime_ns
+        except FileNotFoundError:
             raise FileNotFoundError(f"YAML file not found: {filename}")
 
+        cached = self._cache.get(file_path)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
         try:
-            with open(file_path) as f:
-                return yaml.safe_load(f)
+            with open(file_path, encoding='utf-8', buffering=65536) as f:
+                data = yaml_io.load(f)
         except yaml.YAMLError as e:
-            logger.error(f"Error loading YAML file {filename}: {e!s}")
+            logger.error("Error loading YAML file %s: %s", filename, e)
+            if cached is not None:
+                # Serve the last good version while the file is broken
+                logger.warning("Returning stale cached data for %s", filename)
+                return cached[1]
             raise
 
+        self._cache[file_path] = (mtime_ns, data)
+        return data
+
     def save_yaml(self, filename: str, data: Dict[str, Any]) -> None:
         """Save data to a YAML file in the data directory.
         
@@ -122,55 +205,66 @@ class ConfigManager:
         Raises:
             yaml.YAMLError: If there's an error writing the YAML
         """
-        file_path = self.data_dir / filename
+        file_path = os.path.join(self.data_dir_str, filename)
+        self._cache.pop(file_path, None)
         try:
-            with open(file_path, 'w') as f:
-                yaml.dump(data, f, default_flow_style=False)
+            with open(file_path, 'w', encoding='utf-8', buffering=65536) as f:
+                yaml_io.dump(data, f)
         except yaml.YAMLError as e:
-            logger.error(f"Error saving YAML file {filename}: {e!s}")
+            logger.error("Error saving YAML file %s: %s", filename, e)
             raise
 
-# Global configuration instances
-_settings: Optional[Settings] = None
-_config_manager: Optional[ConfigManager] = None
+    def reload(self) -> None:
+        """Drop all cached YAML data so the next load re-reads from disk."""
+        self._cache.clear()
 
-def init_config() -> None:
-    """Initialize the global configuration instances."""
-    global _settings, _config_manager
+_env_loaded = False
 
+def ensure_env_loaded() -> None:
+    """Load the .env file into os.environ, once per process.
+
+    Existing environment variables take precedence over values in the file.
+    """
+    global _env_loaded
+    if _env_loaded:
+        return
     # Load environment variables from .env file if it exists
     if DOTENV_FILE.exists():
         logger.info(f"Loading environment from {DOTENV_FILE}")
-        _settings = Settings(_env_file=DOTENV_FILE)
+        load_dotenv(DOTENV_FILE)
     else:
         logger.info("No .env file found, using existing environment variables")
-        _settings = Settings()
-
-    logger.info(f"Initializing config manager with settings: {_settings}")
-    _config_manager = ConfigManager(_settings)
+    _env_loaded = True
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Get the global settings instance.
+
+    Settings are built lazily on first use from the process environment
+    (including the .env file, see ``ensure_env_loaded``) and shared for the
+    rest of the process.
     
     Returns:
         Application settings
-        
-    Raises:
-        RuntimeError: If settings are not initialized
     """
-    if not _settings:
-        raise RuntimeError("Settings not initialized")
-    return _settings
+    ensure_env_loaded()
+    return Settings.from_env()
 
+@lru_cache(maxsize=1)
 def get_config_manager() -> ConfigManager:
     """Get the global configuration manager instance.
     
     Returns:
         Configuration manager
-        
-    Raises:
-        RuntimeError: If configuration manager is not initialized
     """
-    if not _config_manager:
-        raise RuntimeError("Configuration manager not initialized")
-    return _config_manager
+    return ConfigManager(get_settings())
+
+def init_config() -> None:
+    """Eagerly build the global configuration instances.
+
+    Optional warm-up: ``get_settings`` and ``get_config_manager`` initialize
+    themselves on first use.
+    """
+    settings = get_settings()
+    logger.info(f"Initializing config manager with settings: {settings}")
+    get_config_manager()
@@ -1,7 +1,8 @@
 from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Any, Dict, List, Optional, TypeVar
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple, TypeVar
+from urllib.parse import urlencode
 
 from .logging import get_logger
 from sqlalchemy import create_engine, Index # Need Index for type checking
@@ -13,7 +14,6 @@ from sqlalchemy.schema import CreateTable, CreateIndex # Import DDL elements
 from .config import get_settings, Settings
 from .logging import get_logger
 # Import SDK components
-from api.common.workspace_client import get_workspace_client
 from databricks.sdk.errors import NotFound, DatabricksError 
 from databricks.sdk.core import Config, oauth_service_principal
 logger = get_logger(__name__)
@@ -42,12 +42,17 @@ class InMemorySession:
         """Discard changes."""
         self.changes = []
 
+def _now_iso() -> str:
+    """Current UTC time as an ISO 8601 string."""
+    return datetime.now(timezone.utc).isoformat()
+
 class InMemoryStore:
     """In-memory storage system."""
 
     def __init__(self):
         """Initialize the in-memory store."""
-        self._data: Dict[str, List[Dict[str, Any]]] = {}
+        # table name -> record id -> record (dicts keep insertion order)
+        self._data: Dict[str, Dict[str, Dict[str, Any]]] = {}
         self._metadata: Dict[str, Dict[str, Any]] = {}
 
     def create_table(self, table_name: str, metadata: Dict[str, Any] = None) -> None:
@@ -58,7 +63,7 @@ class InMemoryStore:
             metadata: Optional metadata for the table
         """
         if table_name not in self._data:
-            self._data[table_name] = []
+            self._data[table_name] = {}
             if metadata:
                 self._metadata[table_name] = metadata
 
@@ -71,16 +76,20 @@ class InMemoryStore:
         """
         if table_name not in self._data:
             self.create_table(table_name)
+        table = self._data[table_name]
 
         # Add timestamp and id if not present
         if 'id' not in data:
-            data['id'] = str(len(self._data[table_name]) + 1)
+            next_id = len(table) + 1
+            while str(next_id) in table:  # only after deletes
+                next_id += 1
+            data['id'] = str(next_id)
         if 'created_at' not in data:
-            data['created_at'] = datetime.utcnow().isoformat()
+            data['created_at'] = _now_iso()
         if 'updated_at' not in data:
             data['updated_at'] = data['created_at']
 
-        self._data[table_name].append(data)
+        table[data['id']] = data
 
     def get(self, table_name: str, id: str) -> Optional[Dict[str, Any]]:
         """Get a record by ID.
@@ -92,9 +101,10 @@ class InMemoryStore:
         Returns:
             Record if found, None otherwise
         """
-        if table_name not in self._data:
+        table = self._data.get(table_name)
+        if table is None:
             return None
-        return next((item for item in self._data[table_name] if item['id'] == id), None)
+        return table.get(id)
 
     def get_all(self, table_name: str) -> List[Dict[str, Any]]:
         """Get all records from a table.
@@ -105,7 +115,8 @@ class InMemoryStore:
         Returns:
             List of records
         """
-        return self._data.get(table_name, [])
+        table = self._data.get(table_name)
+        return list(table.values()) if table else []
 
     def update(self, table_name: str, id: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Update a record.
@@ -118,15 +129,14 @@ class InMemoryStore:
         Returns:
             Updated record if found, None otherwise
         """
-        if table_name not in self._data:
+        table = self._data.get(table_name)
+        item = table.get(id) if table else None
+        if item is None:
             return None
 
-        for item in self._data[table_name]:
-            if item['id'] == id:
-                item.update(data)
-                item['updated_at'] = datetime.utcnow().isoformat()
-                return item
-        return None
+        item.update(data)
+        item['updated_at'] = _now_iso()
+        return item
 
     def delete(self, table_name: str, id: str) -> bool:
         """Delete a record.
@@ -138,12 +148,10 @@ class InMemoryStore:
         Returns:
             True if deleted, False otherwise
         """
-        if table_name not in self._data:
+        table = self._data.get(table_name)
+        if table is None:
             return False
-
-        initial_length = len(self._data[table_name])
-        self._data[table_name] = [item for item in self._data[table_name] if item['id'] != id]
-        return len(self._data[table_name]) < initial_length
+        return table.pop(id, None) is not None
 
     def clear(self, table_name: str) -> None:
         """Clear all records from a table.
@@ -152,7 +160,12 @@ class InMemoryStore:
             table_name: Name of the table
         """
         if table_name in self._data:
-            self._data[table_name] = []
+            self._data[table_name] = {}
+
+    def clear_all(self) -> None:
+        """Remove all tables, records and table metadata."""
+        self._data.clear()
+        self._metadata.clear()
 
 class DatabaseManager:
     """Manages in-memory database operations."""
@@ -177,19 +190,30 @@ class DatabaseManager:
             session.commit()
         except Exception as e:
             session.rollback()
-            logger.error(f"Database session error: {e!s}")
+            logger.error("Database session error: %s", e)
             raise
 
     def dispose(self) -> None:
         """Clear all data from the store."""
-        self.store = InMemoryStore()
+        self.store.clear_all()
 
 # Global database manager instance
 db_manager: Optional[DatabaseManager] = None
 
+# Last URL built by get_db_url, together with the settings it was built from
+_db_url_cache: Optional[Tuple[Settings, str]] = None
+
 def get_db_url(settings: Settings) -> str:
-    """Constructs the Databricks SQLAlchemy URL."""
-    token = os.getenv("DATABRICKS_TOKEN") # Prefer token from env for security
+    """Constructs the Databricks SQLAlchemy URL.
+
+    Settings don't change after startup, so the URL is built once per
+    settings instance and reused.
+    """
+    global _db_url_cache
+    if _db_url_cache is not None and _db_url_cache[0] is settings:
+        return _db_url_cache[1]
+
+    token = settings.DATABRICKS_TOKEN # Populated from the environment / .env by Settings
     if not token:
         logger.warning("DATABRICKS_TOKEN environment variable not set. Relying on SDK default credential provider.")
         # databricks-sqlalchemy uses default creds if token is None
@@ -203,65 +227,104 @@ def get_db_url(settings: Settings) -> str:
     # Construct the URL for databricks-sqlalchemy dialect
     # See: https://github.com/databricks/databricks-sqlalchemy
     # Example: databricks://token:{token}@{host}?http_path={http_path}&catalog={catalog}&schema={schema}
-    url = (
-        f"databricks://token:{token}@{host}"
-        f"?http_path={settings.DATABRICKS_HTTP_PATH}"
-        f"&catalog={settings.DATABRICKS_CATALOG}"
-        f"&schema={settings.DATABRICKS_SCHEMA}"
-    )
-    logger.debug(f"Constructed Databricks SQLAlchemy URL (token redacted)")
+    params = urlencode({
+        "http_path": settings.DATABRICKS_HTTP_PATH,
+        "catalog": settings.DATABRICKS_CATALOG,
+        "schema": settings.DATABRICKS_SCHEMA,
+    })
+    url = f"databricks://token:{token}@{host}?{params}"
+    logger.debug("Constructed Databricks SQLAlchemy URL (token redacted)")
+    _db_url_cache = (settings, url)
     return url
 
+# Fully qualified schema names already verified by ensure_catalog_schema_exists
+_ensured_schemas = set()
+
 def ensure_catalog_schema_exists(settings: Settings):
-    """Checks if the configured catalog and schema exist, creates them if not."""
+    """Checks if the configured catalog and schema exist, creates them if not.
+
+    An existing schema implies an existing catalog, so the common case costs
+    a single API call; the catalog is only checked when the schema is missing.
+    Successful checks are remembered for the rest of the process.
+    """
+    catalog_name = settings.DATABRICKS_CATALOG
+    schema_name = settings.DATABRICKS_SCHEMA
+    full_schema_name = f"{catalog_name}.{schema_name}"
+    if full_schema_name in _ensured_schemas:
+        return
+
     logger.info("Ensuring required catalog and schema exist...")
     try:
         # Get a workspace client instance (use the underlying client to bypass caching)
+        from api.common.workspace_client import get_workspace_client
         caching_ws_client = get_workspace_client(settings)
         ws_client = caching_ws_client._client # Access raw client
-        
-        catalog_name = settings.DATABRICKS_CATALOG
-        schema_name = settings.DATABRICKS_SCHEMA
-        full_schema_name = f"{catalog_name}.{schema_name}"
 
-        # 1. Check/Create Catalog
+        # 1. Check Schema (implies the catalog exists)
+        try:
+            logger.debug(f"Checking existence of schema: {full_schema_name}")
+            ws_client.schemas.get(full_schema_name)
+            logger.info(f"Schema '{full_schema_name}' already exists.")
+            _ensured_schemas.add(full_schema_name)
+            return
+        except NotFound:
+            logger.warning("Schema '%s' not found. Checking catalog before creating it...", full_schema_name)
+        except DatabricksError as e:
+            logger.error("Error checking schema '%s': %s", full_schema_name, e, exc_info=True)
+            raise ConnectionError(f"Failed to check schema '{full_schema_name}': {e}") from e
+
+        # 2. Check/Create Catalog
         try:
             logger.debug(f"Checking existence of catalog: {catalog_name}")
             ws_client.catalogs.get(catalog_name)
             logger.info(f"Catalog '{catalog_name}' already exists.")
         except NotFound:
-            logger.warning(f"Catalog '{catalog_name}' not found. Attempting to create...")
+            logger.warning("Catalog '%s' not found. Attempting to create...", catalog_name)
             try:
                 ws_client.catalogs.create(name=catalog_name)
                 logger.info(f"Successfully created catalog: {catalog_name}")
             except DatabricksError as e:
-                logger.critical(f"Failed to create catalog '{catalog_name}': {e}. Check permissions.", exc_info=True)
+                logger.critical("Failed to create catalog '%s': %s. Check permissions.", catalog_name, e, exc_info=True)
                 raise ConnectionError(f"Failed to create required catalog '{catalog_name}': {e}") from e
         except DatabricksError as e:
-            logger.error(f"Error checking catalog '{catalog_name}': {e}", exc_info=True)
+            logger.error("Error checking catalog '%s': %s", catalog_name, e, exc_info=True)
             raise ConnectionError(f"Failed to check catalog '{catalog_name}': {e}") from e
 
-        # 2. Check/Create Schema
+        # 3. Create Schema
         try:
-            logger.debug(f"Checking existence of schema: {full_schema_name}")
-            ws_client.schemas.get(full_schema_name)
-            logger.info(f"Schema '{full_schema_name}' already exists.")
-        except NotFound:
-            logger.warning(f"Schema '{full_schema_name}' not found. Attempting to create...")
-            try:
-                ws_client.schemas.create(catalog_name=catalog_name, name=schema_name)
-                logger.info(f"Successfully created schema: {full_schema_name}")
-            except DatabricksError as e:
-                logger.critical(f"Failed to create schema '{full_schema_name}': {e}. Check permissions.", exc_info=True)
-                raise ConnectionError(f"Failed to create required schema '{full_schema_name}': {e}") from e
+            ws_client.schemas.create(catalog_name=catalog_name, name=schema_name)
+            logger.info(f"Successfully created schema: {full_schema_name}")
         except DatabricksError as e:
-            logger.error(f"Error checking schema '{full_schema_name}': {e}", exc_info=True)
-            raise ConnectionError(f"Failed to check schema '{full_schema_name}': {e}") from e
-            
+            logger.critical("Failed to create schema '%s': %s. Check permissions.", full_schema_name, e, exc_info=True)
+            raise ConnectionError(f"Failed to create required schema '{full_schema_name}': {e}") from e
+        _ensured_schemas.add(full_schema_name)
+
     except Exception as e:
-        logger.critical(f"An unexpected error occurred during catalog/schema check/creation: {e}", exc_info=True)
+        logger.critical("An unexpected error occurred during catalog/schema check/creation: %s", e, exc_info=True)
         raise ConnectionError(f"Failed during catalog/schema setup: {e}") from e
 
+# Set once the Index objects have been removed from Base.metadata
+_indexes_stripped = False
+
+def _strip_indexes_for_databricks(metadata) -> None:
+    """Remove all Index objects from the metadata's tables, once per process.
+
+    Args:
+        metadata: SQLAlchemy MetaData whose tables should lose their indexes
+    """
+    global _indexes_stripped
+    if _indexes_stripped:
+        return
+    logger.info("Databricks dialect detected. Removing Index objects from metadata before DDL generation.")
+    indexes_to_remove = [idx for table in metadata.tables.values() for idx in table.indexes]
+    for idx in indexes_to_remove:
+        try:
+            idx.table.indexes.discard(idx)
+            logger.debug("Removed index %s from metadata for DDL generation.", idx.name)
+        except Exception as remove_err:
+            logger.warning("Could not fully remove index %s from metadata: %s", idx.name, remove_err)
+    _indexes_stripped = True
+
 def init_db(run_create_all: bool = True) -> None:
     """Initializes the database engine and sessionmaker."""
     global _engine, _SessionLocal
@@ -281,7 +344,7 @@ def init_db(run_create_all: bool = True) -> None:
 
         def get_credentials():
             config = Config(
-                host=os.getenv("DATABRICKS_HOST"),
+                host=settings.DATABRICKS_HOST,
                 client_id=os.getenv("DATABRICKS_CLIENT_ID"),
                 client_secret=os.getenv("DATABRICKS_CLIENT_SECRET")
             )
@@ -320,44 +383,10 @@ def init_db(run_create_all: bool = True) -> None:
             from api.db_models import data_products 
             logger.info("Checking/creating database tables (conditional indexes)...")
             
-            # --- Conditionally Modify Metadata BEFORE DDL Generation ---
-            is_databricks = _engine.dialect.name == 'databricks'
-            if is_databricks:
-                logger.info("Databricks dialect detected. Removing Index objects from metadata before DDL generation.")
-                # Iterate through tables and remove associated Index objects
-                # This prevents create_all from attempting to create them
-                indexes_to_remove = []
-                for table in Base.metadata.tables.values():
-                    # Find indexes associated directly with this table via Column(index=True)
-                    # We check the column's index attribute, not just table.indexes 
-                    # as table.indexes might include functional indexes etc.
-                    for col in table.columns:
-                         if col.index:
-                             # Find the actual Index object SQLAlchemy created for this column
-                             # This is a bit involved as Index name isn't guaranteed
-                             # Let's try removing ALL indexes associated with the table for simplicity
-                             # as UC doesn't support any CREATE INDEX.
-                             logger.debug(f"Preparing to remove indexes associated with table: {table.name}")
-                             # Collect indexes associated with the table to avoid modifying while iterating
-                             for idx in list(table.indexes): # Iterate over a copy
-                                  if idx not in indexes_to_remove:
-                                       indexes_to_remove.append(idx)
-                                       logger.debug(f"Marked index {idx.name} for removal from metadata.")
-                
-                # Actually remove them from the metadata's central index collection if necessary
-                # In newer SQLAlchemy, removing from table.indexes might be sufficient
-                for idx in indexes_to_remove:
-                     try:
-                         # Attempt removal from the table's collection first
-                         if hasattr(idx, 'table') and idx in idx.table.indexes:
-                              idx.table.indexes.remove(idx)
-                         # Attempt removal from metadata collection (less common needed)
-                         # if idx in Base.metadata.indexes:
-                         #     Base.metadata.indexes.remove(idx)
-                         logger.info(f"Successfully removed index {idx.name} from metadata for DDL generation.")
-                     except Exception as remove_err:
-                         logger.warning(f"Could not fully remove index {idx.name} from metadata: {remove_err}")
-            # --- End Conditional Metadata Modification --- 
+            # Unity Catalog doesn't support CREATE INDEX, so drop the Index
+            # objects from the metadata before create_all generates DDL
+            if _engine.dialect.name == 'databricks':
+                _strip_indexes_for_databricks(Base.metadata)
 
             # Now, call create_all. It will operate on the potentially modified metadata.
             logger.info("Executing Base.metadata.create_all()...")
@@ -365,7 +394,7 @@ def init_db(run_create_all: bool = True) -> None:
             logger.info("Database tables checked/created by create_all.")
 
     except Exception as e:
-        logger.error(f"Failed to initialize database: {e}", exc_info=True)
+        logger.error("Failed to initialize database: %s", e, exc_info=True)
         _engine = None
         _SessionLocal = None
         # Simplify error propagation
@@ -383,7 +412,7 @@ def get_db():
         db.commit() # Commit transaction if no exceptions occurred
         logger.debug("Database transaction committed.")
     except Exception as e:
-        logger.error(f"Database transaction failed, rolling back: {e}", exc_info=False) # Avoid logging full trace unless needed
+        logger.error("Database transaction failed, rolling back: %s", e, exc_info=False) # Avoid logging full trace unless needed
         db.rollback()
         raise # Re-raise the exception to be handled by FastAPI error handlers
     finally:
@@ -1,13 +1,17 @@
-from typing import Generator, Optional
+from typing import TYPE_CHECKING, Generator, Optional
 
 from fastapi import HTTPException, status
 
 from .config import Settings, get_settings
 from .database import InMemorySession, get_db
-from .git import GitService, get_git_service
-from .job_runner import JobRunner, get_job_runner
-from .notifications import NotificationService, get_notification_service
-from .search import SearchService, get_search_service
+
+# The service modules pull in libgit2, the jobs runtime and the search
+# backends; import them on first use so loading the dependencies stays cheap.
+if TYPE_CHECKING:
+    from .git import GitService
+    from .job_runner import JobRunner
+    from .notifications import NotificationService
+    from .search import SearchService
 
 
 def get_settings_dep() -> Settings:
@@ -15,27 +19,30 @@ def get_settings_dep() -> Settings:
     return get_settings()
 
 def get_db_dep() -> Generator[InMemorySession, None, None]:
-    """Get database session."""
-    db = get_db()
-    try:
-        yield db
-    finally:
-        db.commit()
+    """Get database session.
+
+    get_db commits on success, rolls back on error and closes the session.
+    """
+    yield from get_db()
 
-def get_notification_service_dep() -> NotificationService:
+def get_notification_service_dep() -> "NotificationService":
     """Get notification service."""
+    from .notifications import get_notification_service
     return get_notification_service()
 
-def get_search_service_dep() -> SearchService:
+def get_search_service_dep() -> "SearchService":
     """Get search service."""
+    from .search import get_search_service
     return get_search_service()
 
-def get_job_runner_dep() -> JobRunner:
+def get_job_runner_dep() -> "JobRunner":
     """Get job runner."""
+    from .job_runner import get_job_runner
     return get_job_runner()
 
-def get_git_service_dep() -> GitService:
+def get_git_service_dep() -> "GitService":
     """Get Git service."""
+    from .git import get_git_service
     return get_git_service()
 
 def get_user_id() -> str:
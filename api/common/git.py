@@ -1,17 +1,27 @@
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
 from datetime import datetime
+from fnmatch import fnmatchcase
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-import git
-import yaml
+import pygit2
 
+from . import yaml_io
 from .config import get_settings
 from .logging import get_logger
 
 logger = get_logger(__name__)
 
 class GitService:
-    """Service for managing YAML files in a Git repository."""
+    """Service for managing YAML files in a Git repository.
+
+    Uses libgit2 (pygit2) in-process rather than spawning git subprocesses.
+    """
 
     def __init__(self) -> None:
         """Initialize the Git service."""
@@ -20,43 +30,186 @@ class GitService:
         self.branch = settings.GIT_BRANCH
         self.username = settings.GIT_USERNAME
         self.password = settings.GIT_PASSWORD
+        self.cache_ttl = settings.GIT_CACHE_TTL
+        self.commit_interval = settings.GIT_COMMIT_INTERVAL
+        self._last_fetch_ts = 0.0
 
-        if not all([self.repo_url, self.username, self.password]):
+        # Saved files waiting for the next batched commit: path -> message
+        self._pending: Dict[str, str] = {}
+        self._pending_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        # Serializes fetch/commit/push against the working copy
+        self._repo_lock = threading.Lock()
+        # Parsed YAML keyed by file name, validated by (mtime_ns, size)
+        self._yaml_cache: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+        # Relative paths (POSIX style) of all files in the working tree
+        self._file_index: Set[str] = set()
+        # Set once the clone/update started below has finished
+        self._ready = threading.Event()
+        # Saves made before the repository was ready, applied once it is:
+        # file name -> (data, commit message). Guarded by _pending_lock.
+        self._deferred: Dict[str, Tuple[Dict[str, Any], str]] = {}
+
+        self.configured = all([self.repo_url, self.username, self.password])
+        if not self.configured:
             logger.warning("Git repository not configured")
             return
 
-        self.repo_dir = Path('api/data/git')
+        # One clone per repository URL, kept across restarts
+        url_key = hashlib.blake2b(self.repo_url.encode()).hexdigest()[:16]
+        self.repo_dir = Path('api/data/git') / url_key
         self.repo_dir.mkdir(parents=True, exist_ok=True)
+        self._meta_path = self.repo_dir / '.git' / 'cache_meta.json'
+        self._callbacks = pygit2.RemoteCallbacks(
+            credentials=pygit2.UserPass(self.username, self.password)
+        )
+
+        # Clone/pull in the background so startup doesn't wait on the network
+        threading.Thread(
+            target=self._init_repo_in_background,
+            name="git-service-init",
+            daemon=True
+        ).start()
 
+    def _init_repo_in_background(self) -> None:
+        """Initialize the repository and mark the service ready."""
         try:
             self._init_repo()
+            self._rebuild_file_index()
         except Exception as e:
             logger.error(f"Error initializing Git repository: {e!s}")
+            if self._deferred:
+                logger.error("%d saves remain queued until the repository is available", len(self._deferred))
+            return
+
+        # Setting ready under the lock means no save can be deferred after
+        # the queue has been taken
+        with self._pending_lock:
+            self._ready.set()
+            deferred, self._deferred = self._deferred, {}
+        for filename, (data, commit_message) in deferred.items():
+            self._write_yaml(filename, data, commit_message)
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the repository to finish initializing.
+        
+        Args:
+            timeout: Maximum number of seconds to wait, or None to wait forever
+            
+        Returns:
+            True if the repository is ready, False otherwise
+        """
+        return self.configured and self._ready.wait(timeout)
+
+    def _check_ready(self) -> bool:
+        """Log and return False if the repository can't be used yet."""
+        if not self.configured:
+            logger.warning("Git repository not configured")
+            return False
+        if not self._ready.is_set():
+            logger.warning("Git repository not ready yet")
+            return False
+        return True
 
     def _init_repo(self) -> None:
-        """Initialize or update the Git repository."""
+        """Initialize or update the Git repository.
+
+        An existing clone that was fetched within the cache TTL is reused
+        without contacting the remote.
+        """
         if not (self.repo_dir / '.git').exists():
             logger.info(f"Cloning repository {self.repo_url}")
-            self.repo = git.Repo.clone_from(
+            self.repo = pygit2.clone_repository(
                 self.repo_url,
-                self.repo_dir,
-                branch=self.branch,
-                env={
-                    'GIT_USERNAME': self.username,
-                    'GIT_PASSWORD': self.password
-                }
+                str(self.repo_dir),
+                checkout_branch=self.branch,
+                callbacks=self._callbacks,
+                depth=1  # Only the tip of the branch is ever read or written
             )
+            self._write_cache_meta()
         else:
+            self.repo = pygit2.Repository(str(self.repo_dir))
+            meta = self._read_cache_meta()
+            if meta.get('url') == self.repo_url and meta.get('branch') == self.branch:
+                self._last_fetch_ts = meta.get('last_fetch_ts', 0.0)
+            self.refresh()
+
+    def refresh(self, force: bool = False) -> None:
+        """Update the clone from origin unless it was fetched within the TTL.
+
+        Args:
+            force: Fetch even if the clone is still fresh
+        """
+        if not force and time.time() - self._last_fetch_ts < self.cache_ttl:
+            return
+        with self._repo_lock:
             logger.info("Updating existing repository")
-            self.repo = git.Repo(self.repo_dir)
-            self.repo.git.pull(
-                'origin',
-                self.branch,
-                env={
-                    'GIT_USERNAME': self.username,
-                    'GIT_PASSWORD': self.password
-                }
-            )
+            self._pull()
+            self._write_cache_meta()
+            self._rebuild_file_index()
+
+    def _rebuild_file_index(self) -> None:
+        """Re-scan the working tree into the in-memory file index."""
+        index = set()
+        for dirpath, dirnames, filenames in os.walk(self.repo_dir):
+            if '.git' in dirnames:
+                dirnames.remove('.git')
+            rel_dir = Path(dirpath).relative_to(self.repo_dir)
+            for name in filenames:
+                index.add((rel_dir / name).as_posix())
+        self._file_index = index
+
+    def _read_cache_meta(self) -> Dict[str, Any]:
+        """Read the fetch metadata stored next to the clone."""
+        try:
+            with open(self._meta_path) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_cache_meta(self) -> None:
+        """Record the remote, branch, fetch time and HEAD of the clone."""
+        self._last_fetch_ts = time.time()
+        meta = {
+            'url': self.repo_url,
+            'branch': self.branch,
+            'last_fetch_ts': self._last_fetch_ts,
+            'head_sha': None if self.repo.head_is_unborn else str(self.repo.head.target),
+        }
+        with open(self._meta_path, 'w') as f:
+            json.dump(meta, f)
+
+    def _pull(self) -> None:
+        """Fetch the tip of the branch from origin and move the branch to it.
+
+        The clone is shallow, so local and remote tips share no history and
+        merge analysis can't relate them. Every save is committed and pushed
+        right away, so the remote tip is always the one to follow.
+        """
+        self.repo.remotes['origin'].fetch(
+            [f'+refs/heads/{self.branch}:refs/remotes/origin/{self.branch}'],
+            callbacks=self._callbacks,
+            depth=1
+        )
+        remote_oid = self.repo.lookup_reference(f'refs/remotes/origin/{self.branch}').target
+        if not self.repo.head_is_unborn and self.repo.head.target == remote_oid:
+            return
+
+        # Safe checkout: fails instead of overwriting uncommitted local edits
+        self.repo.checkout_tree(self.repo.get(remote_oid))
+        branch_ref = f'refs/heads/{self.branch}'
+        if branch_ref in self.repo.references:
+            self.repo.lookup_reference(branch_ref).set_target(remote_oid)
+        else:
+            self.repo.references.create(branch_ref, remote_oid)
+        self.repo.set_head(branch_ref)
+
+    def _signature(self) -> pygit2.Signature:
+        """Commit signature from the git config, falling back to the Git user."""
+        try:
+            return self.repo.default_signature
+        except (KeyError, pygit2.GitError):
+            return pygit2.Signature(self.username, f"{self.username}@localhost")
 
     def save_yaml(
         self,
@@ -64,7 +217,13 @@ class GitService:
         data: Dict[str, Any],
         commit_message: Optional[str] = None
     ) -> bool:
-        """Save data to a YAML file and commit to Git.
+        """Save data to a YAML file and schedule it to be committed to Git.
+
+        The file is written immediately. Saves made within
+        ``GIT_COMMIT_INTERVAL`` seconds of each other are committed and pushed
+        together by a background timer; call ``flush`` to do it right away.
+        Saves made while the repository is still being cloned or updated are
+        queued and written as soon as it is ready.
         
         Args:
             filename: Name of the YAML file
@@ -72,41 +231,97 @@ class GitService:
             commit_message: Optional commit message
             
         Returns:
-            True if successful, False otherwise
+            True if the file was written or queued, False otherwise
         """
-        if not self.repo_url:
+        if not self.configured:
             logger.warning("Git repository not configured")
             return False
 
+        if not commit_message:
+            commit_message = f"Update {filename} at {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')}"
+
+        with self._pending_lock:
+            if not self._ready.is_set():
+                logger.info("Git repository not ready yet; queued save of %s", filename)
+                self._deferred[filename] = (data, commit_message)
+                return True
+
+        return self._write_yaml(filename, data, commit_message)
+
+    def _write_yaml(self, filename: str, data: Dict[str, Any], commit_message: str) -> bool:
+        """Write a YAML file into the working tree and queue it for commit."""
         try:
             # Save YAML file
             file_path = self.repo_dir / filename
-            with open(file_path, 'w') as f:
-                yaml.dump(data, f, default_flow_style=False)
+            self._yaml_cache.pop(filename, None)
+            # Binary stream: libyaml emits UTF-8 bytes straight into the buffer
+            with open(file_path, 'wb', buffering=65536) as f:
+                yaml_io.dump(data, f, encoding='utf-8', sort_keys=False)
+            self._file_index.add(Path(filename).as_posix())
+        except Exception as e:
+            logger.error(f"Error saving YAML file to Git: {e!s}")
+            return False
 
-            # Stage and commit changes
-            self.repo.index.add([str(file_path)])
+        with self._pending_lock:
+            self._pending[Path(filename).as_posix()] = commit_message
+            self._schedule_flush()
+        return True
 
-            if not commit_message:
-                commit_message = f"Update {filename} at {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')}"
+    def _schedule_flush(self) -> None:
+        """Start the flush timer if none is running. Caller holds _pending_lock."""
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.commit_interval, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
 
-            self.repo.index.commit(commit_message)
+    def flush(self) -> bool:
+        """Commit and push all pending saves as a single commit.
 
-            # Push changes
-            self.repo.git.push(
-                'origin',
-                self.branch,
-                env={
-                    'GIT_USERNAME': self.username,
-                    'GIT_PASSWORD': self.password
-                }
-            )
+        Returns:
+            True if there was nothing to do or the push succeeded, False otherwise
+        """
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+        if not pending:
+            return True
+
+        if len(pending) == 1:
+            commit_message = next(iter(pending.values()))
+        else:
+            commit_message = f"Update {len(pending)} files\n\n" + "\n".join(pending.values())
+
+        try:
+            with self._repo_lock:
+                # Stage and commit changes
+                index = self.repo.index
+                for path in pending:
+                    index.add(path)
+                index.write()
+                tree = index.write_tree()
+
+                parents = [] if self.repo.head_is_unborn else [self.repo.head.target]
+                signature = self._signature()
+                self.repo.create_commit('HEAD', signature, signature, commit_message, tree, parents)
+
+                # Push changes
+                self.repo.remotes['origin'].push(
+                    [f'refs/heads/{self.branch}'],
+                    callbacks=self._callbacks
+                )
 
-            logger.info(f"Successfully saved and committed {filename}")
+            logger.info(f"Successfully committed and pushed {', '.join(pending)}")
             return True
 
         except Exception as e:
-            logger.error(f"Error saving YAML file to Git: {e!s}")
+            logger.error(f"Error committing YAML files to Git: {e!s}")
+            # Put the batch back so the next flush retries it; messages from
+            # saves made in the meantime take precedence
+            with self._pending_lock:
+                self._pending = {**pending, **self._pending}
+                self._schedule_flush()
             return False
 
     def load_yaml(self, filename: str) -> Optional[Dict[str, Any]]:
@@ -116,19 +331,30 @@ class GitService:
             filename: Name of the YAML file
             
         Returns:
-            Dictionary containing the YAML data, or None if not found
+            Dictionary containing the YAML data, or None if not found.
+            Repeated calls return the same cached object until the file
+            changes on disk.
         """
-        if not self.repo_url:
-            logger.warning("Git repository not configured")
+        if not self._check_ready():
             return None
 
         try:
+            self.refresh()
             file_path = self.repo_dir / filename
-            if not file_path.exists():
+            try:
+                st = file_path.stat()
+            except FileNotFoundError:
                 return None
 
+            version = (st.st_mtime_ns, st.st_size)
+            cached = self._yaml_cache.get(filename)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+
             with open(file_path) as f:
-                return yaml.safe_load(f)
+                data = yaml_io.load(f)
+            self._yaml_cache[filename] = (version, data)
+            return data
 
         except Exception as e:
             logger.error(f"Error loading YAML file from Git: {e!s}")
@@ -136,6 +362,9 @@ class GitService:
 
     def list_files(self, pattern: str = "*.yaml") -> List[str]:
         """List YAML files in the repository.
+
+        Matches against an in-memory index of the working tree (rebuilt
+        after every clone or pull) instead of walking the directory.
         
         Args:
             pattern: Glob pattern to match files
@@ -143,20 +372,34 @@ class GitService:
         Returns:
             List of matching file names
         """
-        if not self.repo_url:
-            logger.warning("Git repository not configured")
+        if not self._check_ready():
             return []
 
         try:
-            return [
-                str(f.relative_to(self.repo_dir))
-                for f in self.repo_dir.glob(pattern)
-            ]
+            if '**' in pattern:
+                # Recursive patterns keep using the filesystem
+                return [
+                    str(f.relative_to(self.repo_dir))
+                    for f in self.repo_dir.glob(pattern)
+                ]
+            # Like Path.glob, each pattern segment matches one path segment
+            pattern_parts = pattern.split('/')
+            return sorted(
+                path for path in self._file_index
+                if _match_parts(path.split('/'), pattern_parts)
+            )
 
         except Exception as e:
             logger.error(f"Error listing files in Git repository: {e!s}")
             return []
 
+def _match_parts(parts: List[str], pattern_parts: List[str]) -> bool:
+    """Check a split path against a split glob pattern, segment by segment."""
+    return len(parts) == len(pattern_parts) and all(
+        fnmatchcase(part, pattern_part)
+        for part, pattern_part in zip(parts, pattern_parts)
+    )
+
 # Global Git service instance
 git_service: Optional[GitService] = None
 
@@ -164,6 +407,8 @@ def init_git_service() -> None:
     """Initialize the global Git service instance."""
     global git_service
     git_service = GitService()
+    # Don't lose saves still waiting for the batch timer
+    atexit.register(git_service.flush)
 
 def get_git_service() -> GitService:
     """Get the global Git service instance.
@@ -3,7 +3,6 @@ import logging
 from .config import get_settings, init_config
 from .database import init_db
 from .git import init_git_service
-from .job_runner import init_job_runner
 from .logging import setup_logging
 from .notifications import init_notification_service
 from .search import init_search_service
@@ -28,8 +27,8 @@ def init_services() -> None:
     # Initialize database (using in-memory store)
     init_db()
 
-    # Initialize other services
-    init_job_runner()  # Initialize job runner
+    # Initialize other services. Job runners are created per request by
+    # get_job_runner; the Git service clones/pulls in the background.
     init_search_service()
     init_notification_service()
     init_git_service()
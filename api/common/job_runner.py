@@ -1,18 +1,53 @@
+import base64
+import copy
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-import yaml
 from databricks.sdk import WorkspaceClient
 from databricks.sdk.service.jobs import JobSettings
 from databricks.sdk.service.workspace import ImportFormat
 from fastapi import Depends
 
+from . import yaml_io
 from .config import Settings, get_settings
 from .logging import get_logger
 from .workspace_client import get_workspace_client
 
 logger = get_logger(__name__)
 
+# Upper bound on concurrent workspace imports in deploy_job_code
+_MAX_UPLOAD_WORKERS = 16
+# Connections per host the Databricks SDK keeps when not configured otherwise
+_SDK_DEFAULT_POOL_SIZE = 20
+
+# JobRunner is created per request, so these caches live at module level.
+# Volumes already verified or created in this process:
+_ensured_volumes = set()
+# Parsed workflow.yaml files keyed by path, validated by mtime
+_workflow_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+def _load_workflow(workflow_file: Path) -> Dict[str, Any]:
+    """Load a workflow definition, reusing the parsed copy while unchanged.
+
+    Args:
+        workflow_file: Path to the workflow.yaml file
+
+    Returns:
+        Parsed workflow definition (shared; copy before mutating)
+    """
+    key = str(workflow_file)
+    mtime_ns = os.stat(workflow_file).st_mtime_ns
+    cached = _workflow_cache.get(key)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    with open(workflow_file) as f:
+        workflow_config = yaml_io.load(f)
+    _workflow_cache[key] = (mtime_ns, workflow_config)
+    return workflow_config
+
 class JobRunner:
     """Manages Databricks workflow jobs."""
 
@@ -39,6 +74,8 @@ class JobRunner:
         try:
             # Get volume info
             volume_path = f"{self.settings.DATABRICKS_CATALOG}.{self.settings.DATABRICKS_SCHEMA}.{self.settings.DATABRICKS_VOLUME}"
+            if volume_path in _ensured_volumes:
+                return volume_path
 
             try:
                 volume = self.client.volumes.get(volume_path)
@@ -53,6 +90,7 @@ class JobRunner:
                     volume_type="MANAGED"
                 )
 
+            _ensured_volumes.add(volume_path)
             return volume_path
 
         except Exception as e:
@@ -82,7 +120,9 @@ class JobRunner:
             # Create a directory in the volume for this job
             job_volume_path = f"{volume_path}/jobs/{job_name}"
 
-            # Deploy all files from the job directory
+            # Collect the files to deploy and the directories they need
+            uploads = []
+            parent_dirs = set()
             for file_path in job_dir.rglob("*"):
                 if file_path.is_file():
                     # Skip the workflow.yaml file as it's not needed in the volume
@@ -92,10 +132,8 @@ class JobRunner:
                     # Calculate relative path for volume
                     rel_path = file_path.relative_to(job_dir)
                     volume_file_path = f"{job_volume_path}/{rel_path}"
-
-                    # Create parent directories if needed
                     if rel_path.parent != Path("."):
-                        self.client.workspace.mkdirs(f"{job_volume_path}/{rel_path.parent}")
+                        parent_dirs.add(f"{job_volume_path}/{rel_path.parent}")
 
                     # Determine file type and import format
                     if file_path.suffix == ".py":
@@ -105,13 +143,18 @@ class JobRunner:
                     else:
                         format = ImportFormat.AUTO
 
-                    # Import the file
-                    with open(file_path, "rb") as f:
-                        self.client.workspace.import_(
-                            path=volume_file_path,
-                            format=format,
-                            content=f.read()
-                        )
+                    uploads.append((file_path, volume_file_path, format))
+
+            # Create parent directories up front so uploads don't race on them
+            for dir_path in sorted(parent_dirs):
+                self.client.workspace.mkdirs(dir_path)
+
+            # Each import is a separate HTTPS round-trip, so run them concurrently
+            if uploads:
+                workers = min(self._upload_concurrency(), len(uploads))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    # list() re-raises the first upload error, if any
+                    list(executor.map(lambda upload: self._upload_file(*upload), uploads))
 
             logger.info(f"Deployed job code for {job_name} to {job_volume_path}")
             return job_volume_path
@@ -120,6 +163,35 @@ class JobRunner:
             logger.error(f"Error deploying job code for {job_name}: {e!s}")
             return None
 
+    def _upload_concurrency(self) -> int:
+        """Number of uploads to run at once.
+
+        Capped at the SDK's per-host connection pool size, so every upload
+        reuses an open keep-alive connection instead of handshaking a new one.
+        """
+        config = getattr(self.client, "config", None)
+        pool_size = getattr(config, "max_connections_per_pool", None) or _SDK_DEFAULT_POOL_SIZE
+        return max(1, min(_MAX_UPLOAD_WORKERS, pool_size))
+
+    def _upload_file(self, file_path: Path, volume_file_path: str, format: ImportFormat) -> None:
+        """Import a single local file into the workspace.
+        
+        Args:
+            file_path: Local file to upload
+            volume_file_path: Destination path in the workspace
+            format: Import format for the file
+        """
+        # The workspace import API takes the file body as a base64-encoded
+        # string; raw bytes cannot be serialized into the request
+        with open(file_path, "rb") as f:
+            content = base64.b64encode(f.read()).decode("ascii")
+
+        self.client.workspace.import_(
+            path=volume_file_path,
+            format=format,
+            content=content
+        )
+
     def create_job_from_yaml(self, job_name: str) -> Optional[int]:
         """Create a job from a workflow YAML file.
         
@@ -138,8 +210,8 @@ class JobRunner:
             raise FileNotFoundError(f"Workflow file not found: {job_name}/workflow.yaml")
 
         try:
-            with open(workflow_file) as f:
-                workflow_config = yaml.safe_load(f)
+            # Copy, since the task paths below are rewritten in place
+            workflow_config = copy.deepcopy(_load_workflow(workflow_file))
 
             # Deploy job code first
             volume_path = self.deploy_job_code(job_name)
@@ -1,38 +1,102 @@
 import logging
+import re
 import time
-from typing import Awaitable, Callable
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import Response
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from api.common.logging import setup_logging, get_logger
 setup_logging(level=logging.INFO)
 logger = get_logger(__name__)
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+class LoggingMiddleware:
     """Middleware for logging requests and responses."""
 
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response:
-        start_time = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        logger.info(f"{request.method} {request.url.path} completed in {process_time:.3f}s")
-        return response
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-class ErrorHandlingMiddleware(BaseHTTPMiddleware):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not logger.isEnabledFor(logging.INFO):
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start_ns = time.perf_counter_ns()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            process_ns = time.perf_counter_ns() - start_ns
+            logger.info(
+                "%s %s completed with %s in %.3fs",
+                scope['method'], scope['path'], status_code, process_ns / 1e9
+            )
+
+class ErrorHandlingMiddleware:
     """Middleware for handling errors."""
 
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
         try:
-            return await call_next(request)
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
             logger.error(f"Error processing request: {e!s}")
-            return Response(
+            if response_started:
+                # Too late to send a clean error response
+                raise
+            response = Response(
                 content=str(e),
                 status_code=500,
                 media_type="text/plain"
             )
+            await response(scope, receive, send)
+
+class FastNotFoundMiddleware:
+    """Pure ASGI middleware that rejects stray file requests up front.
+
+    Requests outside ``/api/`` and ``/static/`` for asset or script files,
+    such as ``/wp-login.php``, ``/.env`` or a stray ``/main.js``, can be
+    answered with a 404 before the rest of the middleware stack runs. Only
+    known extensions count, since SPA routes may themselves contain dots
+    (e.g. ``/catalog/main.sales.orders``).
+    """
+
+    _PASSTHROUGH = re.compile(r"^/(?:api/|static/|openapi\.json$)")
+    _FILE_LIKE = re.compile(
+        r"\.(?:js|mjs|css|map|json|txt|xml|html?|ico|png|jpe?g|gif|svg|webp"
+        r"|woff2?|ttf|eot|php\d?|aspx?|jsp|cgi|env|ini|bak|sql|git|ya?ml)$",
+        re.IGNORECASE,
+    )
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            path = scope["path"]
+            if not self._PASSTHROUGH.match(path) and self._FILE_LIKE.search(path):
+                response = PlainTextResponse("Not Found", status_code=404)
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
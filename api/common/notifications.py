@@ -1,7 +1,15 @@
-import json
+import asyncio
+import atexit
+import os
+import threading
+from collections import OrderedDict, defaultdict, deque
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from itertools import islice
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import orjson
 
 from .config import get_config_manager
 from .logging import get_logger
@@ -18,6 +26,9 @@ class NotificationType(Enum):
 
 class Notification:
     """Represents a user notification."""
+
+    __slots__ = ('id', 'type', 'message', 'details', 'created_at', '_type_value', '_created_at_iso')
+
     def __init__(
         self,
         id: str,
@@ -40,6 +51,9 @@ class Notification:
         self.message = message
         self.details = details or {}
         self.created_at = created_at or datetime.utcnow()
+        # Neither changes after creation; computed once for to_dict
+        self._type_value = type.value
+        self._created_at_iso = self.created_at.isoformat()
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert notification to dictionary.
@@ -49,10 +63,10 @@ class Notification:
         """
         return {
             "id": self.id,
-            "type": self.type.value,
+            "type": self._type_value,
             "message": self.message,
             "details": self.details,
-            "created_at": self.created_at.isoformat()
+            "created_at": self._created_at_iso
         }
 
     @classmethod
@@ -73,17 +87,88 @@ class Notification:
             created_at=datetime.fromisoformat(data["created_at"])
         )
 
+# Rewrite a user's log once this share of its lines no longer describes a
+# live notification (deleted or superseded by a later update)
+_COMPACT_RATIO = 0.3
+# Most recent notifications kept in memory per user
+_MAX_IN_MEMORY = 1000
+# Maximum number of log files kept open for appending
+_MAX_OPEN_LOGS = 1024
+
+class _LogFilePool:
+    """Keeps append-mode descriptors open for recently written log files.
+
+    Appends go straight to the descriptor with one unbuffered write, so
+    nothing needs flushing; the least recently used descriptor is closed once
+    more than ``max_open`` are open.
+    """
+
+    def __init__(self, max_open: int = _MAX_OPEN_LOGS) -> None:
+        self.max_open = max_open
+        self._fds: "OrderedDict[str, int]" = OrderedDict()
+        # Guards the table and each write, so a descriptor is never closed
+        # by eviction while another thread is writing to it
+        self._lock = threading.Lock()
+
+    def append(self, file_path: Path, payload: bytes) -> None:
+        """Append bytes to a file, opening it if necessary."""
+        key = str(file_path)
+        with self._lock:
+            fd = self._fds.get(key)
+            if fd is None:
+                fd = os.open(key, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                self._fds[key] = fd
+                if len(self._fds) > self.max_open:
+                    _, oldest = self._fds.popitem(last=False)
+                    os.close(oldest)
+            else:
+                self._fds.move_to_end(key)
+            os.write(fd, payload)
+
+    def close(self, file_path: Path) -> None:
+        """Close the descriptor for a file, e.g. before it is replaced."""
+        with self._lock:
+            fd = self._fds.pop(str(file_path), None)
+            if fd is not None:
+                os.close(fd)
+
+    def close_all(self) -> None:
+        """Close every open descriptor."""
+        with self._lock:
+            while self._fds:
+                os.close(self._fds.popitem()[1])
+
 class NotificationService:
-    """Service for managing user notifications."""
+    """Service for managing user notifications.
+
+    Each user's notifications are persisted as an append-only JSON Lines log:
+    every create or update appends the full record, every delete appends a
+    tombstone, and the log is compacted when it accumulates too many stale
+    lines. Only the most recent notifications of each user are kept in
+    memory; older pages are read back from the log.
+    """
 
-    def __init__(self) -> None:
-        """Initialize the notification service."""
+    def __init__(self, max_in_memory: int = _MAX_IN_MEMORY) -> None:
+        """Initialize the notification service.
+
+        Args:
+            max_in_memory: Number of recent notifications kept in memory per user
+        """
         config = get_config_manager()
         self.notifications_dir = config.data_dir / 'notifications'
         self.notifications_dir.mkdir(parents=True, exist_ok=True)
-        self.notifications: Dict[str, List[Notification]] = {}
+        self.max_in_memory = max_in_memory
+        # Per-user most recent notifications, newest first
+        self.notifications: Dict[str, Deque[Notification]] = {}
+        # Serializes file access per user; the I/O itself runs in a worker thread
+        self._locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        # Number of lines and of live notifications in each loaded user's log
+        self._log_lines: Dict[str, int] = {}
+        self._live_counts: Dict[str, int] = {}
+        self._log_files = _LogFilePool()
+        atexit.register(self._log_files.close_all)
 
-    def create_notification(
+    async def create_notification(
         self,
         user_id: str,
         type: NotificationType,
@@ -109,15 +194,17 @@ class NotificationService:
         )
 
         if user_id not in self.notifications:
-            self.notifications[user_id] = []
+            await self._load_notifications(user_id)
 
-        self.notifications[user_id].append(notification)
-        self._save_notifications(user_id)
+        # Creation times only increase, so the newest goes to the front; the
+        # oldest in-memory entry falls off the back and stays on disk only
+        self.notifications[user_id].appendleft(notification)
+        await self._append_records(user_id, [notification.to_dict()], live_delta=1)
 
         logger.info(f"Created notification {notification.id} for user {user_id}")
         return notification
 
-    def get_notifications(
+    async def get_notifications(
         self,
         user_id: str,
         limit: int = 50,
@@ -134,13 +221,18 @@ class NotificationService:
             List of notifications
         """
         if user_id not in self.notifications:
-            self._load_notifications(user_id)
+            await self._load_notifications(user_id)
+
+        recent = self.notifications[user_id]
+        if offset + limit <= len(recent) or len(recent) >= self._live_counts[user_id]:
+            return list(islice(recent, offset, offset + limit))
 
-        notifications = self.notifications.get(user_id, [])
-        notifications.sort(key=lambda x: x.created_at, reverse=True)
-        return notifications[offset:offset + limit]
+        # The page reaches past what is kept in memory; read the full log
+        async with self._locks[user_id]:
+            records, _ = await asyncio.to_thread(_replay_log, self._log_path(user_id))
+        return _newest_first(records)[offset:offset + limit]
 
-    def update_progress(
+    async def update_progress(
         self,
         user_id: str,
         notification_id: str,
@@ -148,6 +240,9 @@ class NotificationService:
         message: Optional[str] = None
     ) -> Optional[Notification]:
         """Update progress of a progress notification.
+
+        Only notifications still held in memory (the most recent ones) can
+        be updated.
         
         Args:
             user_id: ID of the user
@@ -166,12 +261,12 @@ class NotificationService:
                 notification.details["progress"] = progress
                 if message:
                     notification.message = message
-                self._save_notifications(user_id)
+                await self._append_records(user_id, [notification.to_dict()], live_delta=0)
                 return notification
 
         return None
 
-    def delete_notification(self, user_id: str, notification_id: str) -> bool:
+    async def delete_notification(self, user_id: str, notification_id: str) -> bool:
         """Delete a notification.
         
         Args:
@@ -184,54 +279,149 @@ class NotificationService:
         if user_id not in self.notifications:
             return False
 
-        for i, notification in enumerate(self.notifications[user_id]):
+        recent = self.notifications[user_id]
+        for notification in recent:
             if notification.id == notification_id:
-                del self.notifications[user_id][i]
-                self._save_notifications(user_id)
-                return True
+                recent.remove(notification)
+                break
+        else:
+            # Not among the recent ones; it may still be in the log
+            if len(recent) >= self._live_counts[user_id]:
+                return False
+            async with self._locks[user_id]:
+                records, _ = await asyncio.to_thread(_replay_log, self._log_path(user_id))
+            if not any(record["id"] == notification_id for record in records):
+                return False
+
+        await self._append_records(
+            user_id, [{"id": notification_id, "deleted": True}], live_delta=-1
+        )
+        return True
 
-        return False
+    def _log_path(self, user_id: str) -> Path:
+        """Path of a user's notification log."""
+        return self.notifications_dir / f"{user_id}.jsonl"
 
-    def _load_notifications(self, user_id: str) -> None:
-        """Load notifications for a user.
+    def _legacy_path(self, user_id: str) -> Path:
+        """Path of a user's notifications in the old single-JSON-array format."""
+        return self.notifications_dir / f"{user_id}.json"
+
+    async def _load_notifications(self, user_id: str) -> None:
+        """Load a user's most recent notifications by replaying their log.
         
         Args:
             user_id: ID of the user
         """
-        file_path = self.notifications_dir / f"{user_id}.json"
-        if not file_path.exists():
-            self.notifications[user_id] = []
-            return
-
         try:
-            with open(file_path) as f:
-                data = json.load(f)
-                self.notifications[user_id] = [
-                    Notification.from_dict(item)
-                    for item in data
-                ]
+            async with self._locks[user_id]:
+                records, line_count = await asyncio.to_thread(
+                    _migrate_and_replay, self._log_path(user_id), self._legacy_path(user_id)
+                )
+            recent = _newest_first(records)[:self.max_in_memory]
+            self.notifications[user_id] = deque(recent, maxlen=self.max_in_memory)
+            self._log_lines[user_id] = line_count
+            self._live_counts[user_id] = len(records)
         except Exception as e:
             logger.error(f"Error loading notifications for user {user_id}: {e!s}")
-            self.notifications[user_id] = []
+            self.notifications[user_id] = deque(maxlen=self.max_in_memory)
+            self._log_lines[user_id] = 0
+            self._live_counts[user_id] = 0
 
-    def _save_notifications(self, user_id: str) -> None:
-        """Save notifications for a user.
+    async def _append_records(
+        self,
+        user_id: str,
+        records: List[Dict[str, Any]],
+        live_delta: int
+    ) -> None:
+        """Append records to a user's log, compacting it when mostly stale.
         
         Args:
             user_id: ID of the user
+            records: Notification dicts or tombstones to append
+            live_delta: Change in the number of live notifications
         """
-        file_path = self.notifications_dir / f"{user_id}.json"
+        file_path = self._log_path(user_id)
+        payload = b"".join(orjson.dumps(r) + b"\n" for r in records)
         try:
-            with open(file_path, 'w') as f:
-                json.dump(
-                    [n.to_dict() for n in self.notifications[user_id]],
-                    f,
-                    indent=2
-                )
+            async with self._locks[user_id]:
+                await asyncio.to_thread(self._log_files.append, file_path, payload)
+                line_count = self._log_lines.get(user_id, 0) + len(records)
+                live_count = self._live_counts.get(user_id, 0) + live_delta
+                if line_count and (line_count - live_count) / line_count > _COMPACT_RATIO:
+                    # The open descriptor would keep appending to the old file
+                    self._log_files.close(file_path)
+                    live_count = await asyncio.to_thread(_compact_log, file_path)
+                    line_count = live_count
+                self._log_lines[user_id] = line_count
+                self._live_counts[user_id] = live_count
         except Exception as e:
             logger.error(f"Error saving notifications for user {user_id}: {e!s}")
             raise
 
+def _newest_first(records: List[Dict[str, Any]]) -> List[Notification]:
+    """Build notifications from log records, newest first."""
+    notifications = [Notification.from_dict(item) for item in records]
+    # Compaction doesn't preserve log order, so always sort
+    notifications.sort(key=lambda x: x.created_at, reverse=True)
+    return notifications
+
+def _replay_log(file_path: Path) -> Tuple[List[Dict[str, Any]], int]:
+    """Read a notification log (runs in a worker thread).
+
+    Returns:
+        The live notification dicts in creation order, and the number of
+        lines in the log
+    """
+    live: Dict[str, Dict[str, Any]] = {}
+    line_count = 0
+    try:
+        with open(file_path, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                line_count += 1
+                record = orjson.loads(line)
+                if record.get("deleted"):
+                    live.pop(record["id"], None)
+                else:
+                    live[record["id"]] = record
+    except FileNotFoundError:
+        pass
+    return list(live.values()), line_count
+
+def _migrate_and_replay(file_path: Path, legacy_path: Path) -> Tuple[List[Dict[str, Any]], int]:
+    """Import a legacy ``.json`` notification file into the log, then replay
+    the log (runs in a worker thread).
+
+    The legacy file is renamed to ``.json.migrated`` once its records have
+    been appended, so it is imported only once.
+    """
+    try:
+        with open(legacy_path, 'rb') as f:
+            legacy = orjson.loads(f.read())
+    except FileNotFoundError:
+        legacy = None
+    if legacy is not None:
+        if legacy:
+            with open(file_path, 'ab') as f:
+                f.write(b"".join(orjson.dumps(r) + b"\n" for r in legacy))
+        os.replace(legacy_path, legacy_path.with_suffix(".json.migrated"))
+        logger.info("Migrated %s legacy notifications from %s", len(legacy), legacy_path)
+    return _replay_log(file_path)
+
+def _compact_log(file_path: Path) -> int:
+    """Atomically rewrite a log to hold only live records (worker thread).
+
+    Returns:
+        Number of live records written
+    """
+    records, _ = _replay_log(file_path)
+    tmp_path = file_path.with_suffix(".jsonl.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(b"".join(orjson.dumps(r) + b"\n" for r in records))
+    os.replace(tmp_path, file_path)
+    return len(records)
+
 # Global notification service instance
 notification_service: Optional[NotificationService] = None
 
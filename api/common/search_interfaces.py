@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import ClassVar, Iterator, List, Optional, Dict, Any, Tuple
 from pydantic import BaseModel, Field
 
 class SearchIndexItem(BaseModel):
@@ -9,25 +9,34 @@ class SearchIndexItem(BaseModel):
     title: str = Field(..., description="Primary display title for the search result")
     description: Optional[str] = Field(None, description="Short description or snippet for context")
     link: str = Field(..., description="URL path to navigate to the item's details page")
-    tags: List[str] = Field(default_factory=list, description="Associated tags for filtering/searching")
+    # A tuple so that frozen items are hashable and can be deduplicated in sets
+    tags: Tuple[str, ...] = Field(default_factory=tuple, description="Associated tags for filtering/searching")
     # Add other relevant fields if needed, e.g., owner, status, domain
     # owner: Optional[str] = None
     # status: Optional[str] = None
     # domain: Optional[str] = None
 
     class Config:
-        pass # Removed frozen = True
+        frozen = True # Items are never modified after construction
+        extra = "forbid"
 
 class SearchableAsset(ABC):
     """Abstract Base Class for managers that provide searchable items."""
 
+    # Recommended number of source records to fetch per round trip when
+    # producing search items
+    BATCH_SIZE: ClassVar[int] = 500
+
     @abstractmethod
-    def get_search_index_items(self) -> List[SearchIndexItem]:
+    def get_search_index_items(self) -> Iterator[SearchIndexItem]:
         """
         Fetches items from the manager's domain and maps them
         to the standardized SearchIndexItem format.
 
+        Implementations should yield items as they are mapped rather than
+        building the full list, so the indexer can consume them as a stream.
+
         Returns:
-            List[SearchIndexItem]: A list of items prepared for the global search index.
+            Iterator[SearchIndexItem]: Items prepared for the global search index.
         """
         pass 
\ No newline at end of file
@@ -1,11 +1,18 @@
 import logging
-import signal
+import queue
+import random
+import threading
 import time
-from functools import wraps
-from typing import Any, Callable, Dict, Optional
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, Generator, Iterable, Iterator, Optional, Tuple
 
 from databricks import sql
 from databricks.sdk import WorkspaceClient
+from databricks.sdk.core import Config
+from databricks.sdk.service.catalog import DataSourceFormat, TableInfo, TableType
 from fastapi import Depends
 
 from .config import Settings, get_settings
@@ -18,13 +25,123 @@ logger = get_logger(__name__)
 class TimeoutError(Exception):
     """Exception raised when a function times out."""
 
+# Maximum number of cached API results per client
+_CACHE_MAX_ENTRIES = 1024
+
+# Seconds a failed call is remembered before the API is tried again, plus up
+# to _NEGATIVE_TTL_JITTER more so keys that failed together don't retry together
+_NEGATIVE_TTL = 5.0
+_NEGATIVE_TTL_JITTER = 2.0
+
+# Every table visible to the caller, across all catalogs, in one round trip
+_TABLES_QUERY = """
+SELECT table_catalog, table_schema, table_name, table_type, table_owner, comment,
+       created, created_by, last_altered, last_altered_by, data_source_format
+FROM system.information_schema.tables
+"""
+
+# Runs API calls so callers can stop waiting after the timeout. Signal-based
+# alarms only work on the main thread, not in FastAPI's worker threads.
+_API_CALL_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="workspace-api")
+
+def _enum_or_none(enum_cls, value):
+    """Convert an information_schema string to an SDK enum, or None if unknown."""
+    try:
+        return enum_cls(value)
+    except ValueError:
+        return None
+
+def _epoch_ms(value) -> Optional[int]:
+    """Convert a SQL timestamp to epoch milliseconds like the REST API uses."""
+    return int(value.timestamp() * 1000) if value is not None else None
+
+# Attributes served by the cached namespaces rather than the wrapped client
+_HANDLED_ATTRS = frozenset({'clusters', 'connections', 'catalogs', 'schemas', 'tables'})
+
+class _CachedCall:
+    """A function whose result is cached in a CachingWorkspaceClient.
+
+    Cached results are served until they expire; a refresh that fails falls
+    back to the expired result, and the failure is remembered for a few
+    seconds so retries don't hit the API again.
+    """
+
+    __slots__ = ('_client', '_key', '_func')
+
+    def __init__(self, client: 'CachingWorkspaceClient', key: str, func: Callable) -> None:
+        self._client = client
+        self._key = key
+        self._func = func
+
+    def __call__(self, *args, **kwargs):
+        client = self._client
+        key = self._key
+        # Check if we have a cached result that's still valid (lock-free)
+        entry = client._cache.get(key)
+        if entry is not None:
+            now = time.monotonic()
+            if now < entry[1]:
+                logger.info("Cache hit for %s (age: %.1fs)", key, now - entry[1] + client._cache_duration)
+                return entry[0]
+
+        with client._key_lock(key):
+            # Another thread may have refreshed it while we waited
+            entry = client._cache.get(key)
+            if entry is not None:
+                now = time.monotonic()
+                if now < entry[1]:
+                    logger.info("Cache hit for %s (age: %.1fs)", key, now - entry[1] + client._cache_duration)
+                    return entry[0]
+
+            # Don't call the API again while a recent failure is remembered
+            failure = client._failures.get(key)
+            if failure is not None and time.monotonic() < failure[1]:
+                if entry is not None:
+                    return entry[0]
+                raise failure[0]
+
+            # Call the actual function and cache the result
+            logger.debug("Cache miss for %s, calling Databricks workspace", key)
+            try:
+                result = client._make_api_call(self._func, *args, **kwargs)
+                client._failures.pop(key, None)
+                client._store(key, result)
+                return result
+            except Exception as e:
+                if isinstance(e, TimeoutError):
+                    logger.error("Timeout while fetching %s: %s", key, e)
+                else:
+                    logger.error("Error fetching %s: %s", key, e)
+                client._remember_failure(key, e)
+                # Return cached data if available, even if expired
+                if entry is not None:
+                    logger.warning("Returning stale cached data for %s", key)
+                    return entry[0]
+                raise
+
 class CachingWorkspaceClient(WorkspaceClient):
     def __init__(self, client: WorkspaceClient, timeout: int = 30):
         self._client = client
-        self._cache: Dict[str, Any] = {}
-        self._cache_times: Dict[str, float] = {}
         self._cache_duration = 300  # 5 minutes in seconds
+        # key -> (result, expires_at). Entries outlive their expiry so they can
+        # be served as stale data if a refresh fails. Replaced whole, never
+        # mutated, so reads need no lock.
+        self._cache: Dict[str, Tuple[Any, float]] = {}
+        # Table listings filled by prime_tables_cache, kept apart from _cache
+        # so priming many schemas can't evict other entries. Replaced whole.
+        self._primed_tables: Dict[str, Tuple[Any, float]] = {}
+        # key -> (exception, retry_at) for calls that recently failed
+        self._failures: Dict[str, Tuple[Exception, float]] = {}
+        # One lock per key, so only one thread refreshes a given entry
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()  # Guards _key_locks and cache eviction
         self._timeout = timeout
+        # Cached API namespaces, built once and returned by the properties below
+        self._ns_clusters = CachedClusters(self)
+        self._ns_connections = CachedConnections(self)
+        self._ns_catalogs = CachedCatalogs(self)
+        self._ns_schemas = CachedSchemas(self)
+        self._ns_tables = CachedTables(self)
 
     def __call__(self, timeout: int = 30):
         return CachingWorkspaceClient(self._client, timeout=timeout)
@@ -43,138 +160,259 @@ class CachingWorkspaceClient(WorkspaceClient):
         Raises:
             TimeoutError: If the function call times out
         """
-        def handler(signum, frame):
+        future = _API_CALL_EXECUTOR.submit(func, *args, **kwargs)
+        try:
+            return future.result(timeout=self._timeout)
+        except FuturesTimeoutError:
             raise TimeoutError(f"Function call timed out after {self._timeout} seconds")
 
-        # Set the timeout handler
-        original_handler = signal.signal(signal.SIGALRM, handler)
-        signal.alarm(self._timeout)
+    def _key_lock(self, key: str) -> threading.Lock:
+        """Return the lock that serializes refreshes of one cache key."""
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _store(self, key: str, result: Any) -> None:
+        """Cache a result, evicting the oldest entries beyond the size limit."""
+        with self._lock:
+            self._cache.pop(key, None)  # Re-insert so the dict stays in age order
+            self._cache[key] = (result, time.monotonic() + self._cache_duration)
+            while len(self._cache) > _CACHE_MAX_ENTRIES:
+                oldest = next(iter(self._cache))
+                del self._cache[oldest]
+                self._key_locks.pop(oldest, None)
+
+    def _cache_result(self, key: str) -> Callable[[Callable], '_CachedCall']:
+        """Return a decorator that caches a function's result under ``key``."""
+        return partial(_CachedCall, self, key)
+
+    def _remember_failure(self, key: str, e: Exception) -> None:
+        """Record a failed call so retries within the negative TTL fail fast."""
+        retry_at = time.monotonic() + _NEGATIVE_TTL + random.uniform(0, _NEGATIVE_TTL_JITTER)
+        with self._lock:
+            self._failures.pop(key, None)  # Re-insert so the dict stays in age order
+            self._failures[key] = (e, retry_at)
+            while len(self._failures) > _CACHE_MAX_ENTRIES:
+                del self._failures[next(iter(self._failures))]
+
+    def _iter_cached(self, key: str, fetch: Callable[[], Iterable]) -> Iterator:
+        """Yield a cached listing, or stream it from the API and cache it.
+
+        Unlike the ``list`` methods, the caller gets each item as soon as the
+        SDK has fetched its page. The listing is cached as a tuple only once
+        it has been consumed completely.
 
-        try:
-            result = func(*args, **kwargs)
-            return result
-        finally:
-            # Restore the original handler and cancel the alarm
-            signal.alarm(0)
-            signal.signal(signal.SIGALRM, original_handler)
-
-    def _cache_result(self, key: str) -> Callable:
-        def decorator(func: Callable) -> Callable:
-            @wraps(func)
-            def wrapper(*args, **kwargs):
-                current_time = time.time()
-                # Check if we have a cached result that's still valid
-                if (
-                    key in self._cache
-                    and key in self._cache_times
-                    and current_time - self._cache_times[key] < self._cache_duration
-                ):
-                    logger.info(f"Cache hit for {key} (age: {current_time - self._cache_times[key]:.1f}s)")
-                    return self._cache[key]
-
-                # Call the actual function and cache the result
-                logger.info(f"Cache miss for {key}, calling Databricks workspace")
-                try:
-                    result = self._make_api_call(func, *args, **kwargs)
-                    self._cache[key] = result
-                    self._cache_times[key] = current_time
-                    return result
-                except TimeoutError as e:
-                    logger.error(f"Timeout while fetching {key}: {e}")
-                    # Return cached data if available, even if expired
-                    if key in self._cache:
-                        logger.warning(f"Returning stale cached data for {key}")
-                        return self._cache[key]
-                    raise
-                except Exception as e:
-                    logger.error(f"Error fetching {key}: {e}")
-                    # Return cached data if available, even if expired
-                    if key in self._cache:
-                        logger.warning(f"Returning stale cached data for {key}")
-                        return self._cache[key]
-                    raise
-            return wrapper
-        return decorator
+        Args:
+            key: Cache key of the listing
+            fetch: Returns the SDK's (paginating) generator
+        """
+        entry = self._cache.get(key)
+        if entry is not None and time.monotonic() < entry[1]:
+            yield from entry[0]
+            return
+
+        items = []
+        for item in fetch():
+            items.append(item)
+            yield item
+        self._store(key, tuple(items))
+
+    def prime_tables_cache(self, sql_conn) -> int:
+        """Populate the ``tables.list`` cache for every schema with one query.
+
+        Replaces one REST call per (catalog, schema) with a single
+        information_schema query over a SQL warehouse connection. The primed
+        listings are held separately from the LRU cache and are only served
+        while no REST result for the same schema is cached.
+
+        Primed ``TableInfo`` objects carry the names, type, owner, comment,
+        data source format and created/updated metadata, but not
+        ``columns``, ``properties`` or storage details, which
+        information_schema.tables doesn't expose. Callers that need those
+        must fetch the table itself.
 
-    @property
-    def clusters(self):
-        class CachedClusters:
-            def __init__(self, parent):
-                self._parent = parent
+        Args:
+            sql_conn: Open Databricks SQL connection
 
-            def list(self):
-                return self._parent._cache_result('clusters.list')(
-                    lambda: list(self._parent._client.clusters.list())
-                )()
+        Returns:
+            Number of (catalog, schema) cache entries populated
+        """
+        with sql_conn.cursor() as cursor:
+            cursor.execute(_TABLES_QUERY)
+            rows = cursor.fetchall()
+
+        grouped = defaultdict(list)
+        for (catalog, schema, name, table_type, owner, comment,
+             created, created_by, last_altered, last_altered_by, data_source_format) in rows:
+            grouped[(catalog, schema)].append(TableInfo(
+                catalog_name=catalog,
+                schema_name=schema,
+                name=name,
+                full_name=f"{catalog}.{schema}.{name}",
+                table_type=_enum_or_none(TableType, table_type),
+                owner=owner,
+                comment=comment,
+                # The REST API reports these as epoch milliseconds
+                created_at=_epoch_ms(created),
+                created_by=created_by,
+                updated_at=_epoch_ms(last_altered),
+                updated_by=last_altered_by,
+                data_source_format=_enum_or_none(DataSourceFormat, data_source_format),
+            ))
+
+        expires_at = time.monotonic() + self._cache_duration
+        self._primed_tables = {
+            f'tables.list::{catalog}::{schema}': (tuple(tables), expires_at)
+            for (catalog, schema), tables in grouped.items()
+        }
+        logger.info("Primed table cache for %s schemas from %s tables", len(grouped), len(rows))
+        return len(grouped)
+
+    def _get_primed(self, key: str) -> Optional[Tuple]:
+        """Return a primed table listing if it's fresh and nothing newer is cached."""
+        if key in self._cache:
+            return None
+        entry = self._primed_tables.get(key)
+        if entry is not None and time.monotonic() < entry[1]:
+            return entry[0]
+        return None
 
-        return CachedClusters(self)
+    @property
+    def clusters(self):
+        return self._ns_clusters
 
     @property
     def connections(self):
-        class CachedConnections:
-            def __init__(self, parent):
-                self._parent = parent
-
-            def list(self):
-                return self._parent._cache_result('connections.list')(
-                    lambda: list(self._parent._client.connections.list())
-                )()
-
-        return CachedConnections(self)
+        return self._ns_connections
 
     @property
     def catalogs(self):
-        class CachedCatalogs:
-            def __init__(self, parent):
-                self._parent = parent
-
-            def list(self):
-                return self._parent._cache_result('catalogs.list')(
-                    lambda: list(self._parent._client.catalogs.list())
-                )()
-
-        return CachedCatalogs(self)
+        return self._ns_catalogs
 
     @property
     def schemas(self):
-        class CachedSchemas:
-            def __init__(self, parent):
-                self._parent = parent
-
-            # Schemas are listed per catalog
-            def list(self, catalog_name: str):
-                cache_key = f'schemas.list::{catalog_name}' 
-                return self._parent._cache_result(cache_key)(
-                    # Convert generator to list for caching
-                    lambda: list(self._parent._client.schemas.list(catalog_name=catalog_name))
-                )()
-
-        return CachedSchemas(self)
+        return self._ns_schemas
 
     @property
     def tables(self):
-        class CachedTables:
-            def __init__(self, parent):
-                self._parent = parent
-
-            # Tables are listed per catalog and schema
-            def list(self, catalog_name: str, schema_name: str):
-                cache_key = f'tables.list::{catalog_name}::{schema_name}'
-                return self._parent._cache_result(cache_key)(
-                    # Convert generator to list for caching
-                    lambda: list(self._parent._client.tables.list(catalog_name=catalog_name, schema_name=schema_name))
-                )()
-
-        return CachedTables(self)
+        return self._ns_tables
 
     # Delegate all other attributes to the original client
     def __getattr__(self, name):
         # Ensure we don't accidentally delegate properties we've explicitly handled
-        if name in ['clusters', 'connections', 'catalogs', 'schemas', 'tables']:
+        if name in _HANDLED_ATTRS:
             # This case shouldn't typically be hit due to @property lookups,
             # but added as a safeguard.
-             raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}' - use the property")
-        return getattr(self._client, name)
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}' - use the property")
+        attr = getattr(self._client, name)
+        # Store on the instance so later lookups find it without calling
+        # __getattr__ (this doesn't apply to names that are properties of
+        # WorkspaceClient, which always take precedence over the instance dict)
+        self.__dict__[name] = attr
+        return attr
+
+class CachedClusters:
+    def __init__(self, parent: 'CachingWorkspaceClient'):
+        self._parent = parent
+        self._list_fn = parent._cache_result('clusters.list')(
+            lambda: list(parent._client.clusters.list())
+        )
+
+    def list(self):
+        return self._list_fn()
+
+class CachedConnections:
+    def __init__(self, parent: 'CachingWorkspaceClient'):
+        self._parent = parent
+        self._list_fn = parent._cache_result('connections.list')(
+            lambda: list(parent._client.connections.list())
+        )
+
+    def list(self):
+        return self._list_fn()
+
+class CachedCatalogs:
+    def __init__(self, parent: 'CachingWorkspaceClient'):
+        self._parent = parent
+        self._list_fn = parent._cache_result('catalogs.list')(
+            lambda: list(parent._client.catalogs.list())
+        )
+
+    def list(self):
+        return self._list_fn()
+
+class CachedSchemas:
+    def __init__(self, parent: 'CachingWorkspaceClient'):
+        self._parent = parent
+        # Cached list callables per catalog name
+        self._by_args: Dict[Tuple[str], Callable] = {}
+
+    # Schemas are listed per catalog
+    def list(self, catalog_name: str):
+        list_fn = self._by_args.get((catalog_name,))
+        if list_fn is None:
+            client = self._parent._client
+            list_fn = self._by_args.setdefault((catalog_name,), self._parent._cache_result(f'schemas.list::{catalog_name}')(
+                # Materialize the generator as a tuple for caching
+                lambda: tuple(client.schemas.list(catalog_name=catalog_name))
+            ))
+        return list_fn()
+
+    def iter_list(self, catalog_name: str) -> Iterator:
+        client = self._parent._client
+        return self._parent._iter_cached(
+            f'schemas.list::{catalog_name}',
+            lambda: client.schemas.list(catalog_name=catalog_name)
+        )
+
+class CachedTables:
+    def __init__(self, parent: 'CachingWorkspaceClient'):
+        self._parent = parent
+        # Cached list callables per (catalog name, schema name)
+        self._by_args: Dict[Tuple[str, str], Callable] = {}
+
+    # Tables are listed per catalog and schema
+    def list(self, catalog_name: str, schema_name: str):
+        primed = self._parent._get_primed(f'tables.list::{catalog_name}::{schema_name}')
+        if primed is not None:
+            return primed
+        args = (catalog_name, schema_name)
+        list_fn = self._by_args.get(args)
+        if list_fn is None:
+            client = self._parent._client
+            list_fn = self._by_args.setdefault(args, self._parent._cache_result(f'tables.list::{catalog_name}::{schema_name}')(
+                # Materialize the generator as a tuple for caching
+                lambda: tuple(client.tables.list(catalog_name=catalog_name, schema_name=schema_name))
+            ))
+        return list_fn()
+
+    def iter_list(self, catalog_name: str, schema_name: str) -> Iterator:
+        primed = self._parent._get_primed(f'tables.list::{catalog_name}::{schema_name}')
+        if primed is not None:
+            return iter(primed)
+        client = self._parent._client
+        return self._parent._iter_cached(
+            f'tables.list::{catalog_name}::{schema_name}',
+            lambda: client.tables.list(catalog_name=catalog_name, schema_name=schema_name)
+        )
+
+@lru_cache(maxsize=4)
+def _get_cached_ws(host: str, token: Optional[str], timeout: int) -> CachingWorkspaceClient:
+    """Build the caching workspace client for one host/token/timeout combination.
+
+    Memoized, so every caller in the process shares the same client, HTTP
+    connection pool and result cache.
+    """
+    # Log environment values with obfuscated token
+    masked_token = f"{token[:4]}...{token[-4:]}" if token else None
+    logger.info("Initializing workspace client with host: %s, token: %s, timeout: %ss", host, masked_token, timeout)
+
+    # The SDK enforces the timeout on each HTTP request itself
+    client = WorkspaceClient(config=Config(
+        host=host,
+        token=token,
+        http_timeout_seconds=timeout
+    ))
+    return CachingWorkspaceClient(client, timeout=timeout)
 
 def get_workspace_client(settings: Optional[Settings] = None, timeout: int = 30) -> WorkspaceClient:
     """Get a configured Databricks workspace client with caching.
@@ -184,20 +422,125 @@ def get_workspace_client(settings: Optional[Settings] = None, timeout: int = 30)
         timeout: Timeout in seconds for API calls
         
     Returns:
-        Cached workspace client instance
+        Cached workspace client instance, shared across the process
     """
     if settings is None:
         settings = get_settings()
+    return _get_cached_ws(settings.DATABRICKS_HOST, settings.DATABRICKS_TOKEN, timeout)
 
-    # Log environment values with obfuscated token
-    masked_token = f"{settings.DATABRICKS_TOKEN[:4]}...{settings.DATABRICKS_TOKEN[-4:]}" if settings.DATABRICKS_TOKEN else None
-    logger.info(f"Initializing workspace client with host: {settings.DATABRICKS_HOST}, token: {masked_token}, timeout: {timeout}s")
+class SqlConnectionPool:
+    """Fixed-size pool of Databricks SQL connections.
+
+    Connections are opened lazily up to ``size``; once all are in use,
+    callers block until one is returned. A connection that sat idle for
+    longer than ``validate_after`` seconds is checked with ``SELECT 1`` before
+    being handed out, and replaced if it no longer works.
+    """
+
+    def __init__(self, connect: Callable[[], Any], size: int = 4, validate_after: float = 60.0) -> None:
+        self._connect = connect
+        self.size = size
+        self.validate_after = validate_after
+        # Idle connections with the monotonic time they were returned
+        self._idle: "queue.LifoQueue[Tuple[Any, float]]" = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> Any:
+        """Take a connection from the pool, opening one if below the limit."""
+        try:
+            conn, returned_at = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._opened < self.size
+                if can_open:
+                    self._opened += 1
+            if can_open:
+                try:
+                    return self._connect()
+                except Exception:
+                    with self._lock:
+                        self._opened -= 1
+                    raise
+            conn, returned_at = self._idle.get()
+
+        if time.monotonic() - returned_at > self.validate_after and not self._is_healthy(conn):
+            self._close(conn)
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+        return conn
+
+    def release(self, conn: Any) -> None:
+        """Return a connection; closed connections are dropped from the pool."""
+        if getattr(conn, "open", True):
+            self._idle.put((conn, time.monotonic()))
+        else:
+            with self._lock:
+                self._opened -= 1
+
+    def close_all(self) -> None:
+        """Close every idle connection."""
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(conn)
+            with self._lock:
+                self._opened -= 1
+
+    @staticmethod
+    def _is_healthy(conn: Any) -> bool:
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+            return True
+        except Exception as e:
+            logger.warning("Discarding broken SQL connection: %s", e)
+            return False
+
+    @staticmethod
+    def _close(conn: Any) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+@lru_cache(maxsize=1)
+def _get_sql_pool() -> SqlConnectionPool:
+    """Build the SQL connection pool for the configured warehouse.
 
-    client = WorkspaceClient(
-        host=settings.DATABRICKS_HOST,
-        token=settings.DATABRICKS_TOKEN
+    Settings don't change after startup, so the connect arguments are
+    resolved once here instead of on every request.
+    """
+    settings = get_settings()
+    connect_kwargs = {
+        "server_hostname": settings.DATABRICKS_HOST.replace("https://", ""),
+        "http_path": settings.DATABRICKS_HTTP_PATH,
+        "access_token": settings.DATABRICKS_TOKEN,
+    }
+    logger.info(
+        "Creating SQL connection pool of size %s for %s%s",
+        settings.DBSQL_POOL_SIZE, connect_kwargs['server_hostname'], connect_kwargs['http_path']
     )
-    return CachingWorkspaceClient(client, timeout=timeout)
+    return SqlConnectionPool(lambda: sql.connect(**connect_kwargs), size=settings.DBSQL_POOL_SIZE)
+
+def get_sql_connection() -> Generator[Any, None, None]:
+    """FastAPI dependency yielding a pooled Databricks SQL connection.
+
+    The connection goes back to the pool when the request finishes.
+    """
+    pool = _get_sql_pool()
+    conn = pool.acquire()
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
 
 def get_workspace_client_dependency(timeout: int = 30):
     """Returns the actual dependency function for FastAPI."""
@@ -0,0 +1,41 @@
+from typing import IO, Any, Optional
+
+import yaml
+
+# Prefer the libyaml-backed loader/dumper; fall back to the pure-Python ones
+try:
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
+
+def load(stream: Any) -> Any:
+    """Parse a YAML document into plain Python objects.
+
+    Args:
+        stream: File object, bytes or string containing YAML
+
+    Returns:
+        Parsed data (dicts, lists and scalars)
+
+    Raises:
+        yaml.YAMLError: If the document contains invalid YAML
+    """
+    return yaml.load(stream, Loader=SafeLoader)
+
+def dump(data: Any, stream: Optional[IO] = None, **kwargs: Any) -> Any:
+    """Serialize plain Python objects to YAML.
+
+    Args:
+        data: Data to serialize
+        stream: Optional file object to write to
+        **kwargs: Extra options passed to yaml.dump (block style by default)
+
+    Returns:
+        The YAML string if no stream was given, None otherwise
+
+    Raises:
+        yaml.YAMLError: If the data cannot be represented as YAML
+    """
+    kwargs.setdefault('default_flow_style', False)
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)
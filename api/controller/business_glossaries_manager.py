@@ -1,11 +1,13 @@
 import logging
+import re
 import uuid
+from collections import defaultdict, deque
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Set
+from operator import attrgetter
+from typing import Any, Dict, List, Optional, Set, Iterator, Tuple
 
-import yaml
-
-from api.models.business_glossary import BusinessGlossary, Domain, GlossaryTerm
+from api.common import yaml_io
+from api.models.business_glossary import TERM_KEYS, BusinessGlossary, Domain, GlossaryTerm
 
 # Import Search Interfaces
 from api.common.search_interfaces import SearchableAsset, SearchIndexItem
@@ -14,11 +16,58 @@ from api.common.logging import setup_logging, get_logger
 setup_logging(level=logging.INFO)
 logger = get_logger(__name__)
 
+_WORD_RE = re.compile(r"\w+")
+# term_to_dict leaves out the tagged assets
+_TERM_DICT_KEYS = tuple(key for key in TERM_KEYS if key != 'taggedAssets')
+_term_dict_values = attrgetter(*_TERM_DICT_KEYS)
+# Term attributes that search_terms looks at
+_SEARCHED_FIELDS = frozenset({'name', 'definition', 'synonyms'})
+
+def _tokenize(text: str) -> Set[str]:
+    """Split already lowercased text into its distinct words"""
+    return set(_WORD_RE.findall(text))
+
+def _parse_iso(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp, accepting a trailing 'Z' for UTC"""
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value)
+
+def _build_term(term: Dict[str, Any], glossary_id: str) -> GlossaryTerm:
+    """Create a GlossaryTerm from its YAML representation"""
+    return GlossaryTerm(
+        id=term['id'],
+        name=term['name'],
+        definition=term['definition'],
+        domain=term['domain'],
+        abbreviation=term.get('abbreviation'),
+        synonyms=term.get('synonyms', []),
+        examples=term.get('examples', []),
+        tags=term.get('tags', []),
+        owner=term.get('owner', ''),
+        status=term.get('status', 'active'),
+        created_at=_parse_iso(term['created_at']),
+        updated_at=_parse_iso(term['updated_at']),
+        source_glossary_id=glossary_id,
+        taggedAssets=term.get('taggedAssets', [])
+    )
+
 # Inherit from SearchableAsset
 class BusinessGlossariesManager(SearchableAsset):
     def __init__(self):
         self._domains: Dict[str, Domain] = {}
         self._glossaries: Dict[str, BusinessGlossary] = {}
+        # term id -> (owning glossary, term), kept in step with glossary.terms
+        self._term_index: Dict[str, Tuple[BusinessGlossary, GlossaryTerm]] = {}
+        # Inverted index for search: lowercased word -> (glossary id, term id)
+        # of terms whose name, definition or synonyms contain it, plus each
+        # term's words. Keyed per glossary since term ids may repeat across them
+        self._postings: Dict[str, Set[Tuple[str, str]]] = defaultdict(set)
+        self._term_tokens: Dict[Tuple[str, str], Set[str]] = {}
+        # Results of get_combined_terms / _get_relevant_glossaries per org
+        # unit; cleared whenever glossaries or terms change
+        self._combined_cache: Dict[str, List[GlossaryTerm]] = {}
+        self._relevant_cache: Dict[str, List[BusinessGlossary]] = {}
 
     def create_term(self,
                    name: str,
@@ -56,10 +105,8 @@ class BusinessGlossariesManager(SearchableAsset):
 
     def get_term(self, term_id: str) -> Optional[GlossaryTerm]:
         """Get a glossary term by ID"""
-        for glossary in self._glossaries.values():
-            if term_id in glossary.terms:
-                return glossary.terms[term_id]
-        return None
+        entry = self._term_index.get(term_id)
+        return entry[1] if entry else None
 
     def list_terms(self) -> List[GlossaryTerm]:
         """List all glossary terms"""
@@ -70,34 +117,61 @@ class BusinessGlossariesManager(SearchableAsset):
 
     def update_term(self, term_id: str, **kwargs) -> Optional[GlossaryTerm]:
         """Update a glossary term"""
-        for glossary in self._glossaries.values():
-            if term_id in glossary.terms:
-                term = glossary.terms[term_id]
-                for key, value in kwargs.items():
-                    if hasattr(term, key):
-                        setattr(term, key, value)
-                term.updated = datetime.utcnow()
-                return term
-        return None
+        entry = self._term_index.get(term_id)
+        if not entry:
+            return None
+        term = entry[1]
+        for key, value in kwargs.items():
+            if hasattr(term, key):
+                setattr(term, key, value)
+        term.updated_at = datetime.utcnow()
+        if 'name' in kwargs:
+            # Combined terms are merged by name
+            self._invalidate_combined()
+        if _SEARCHED_FIELDS.intersection(kwargs):
+            term.refresh_search_fields()
+            self._index_tokens(entry[0], term)
+        return term
 
     def delete_term(self, term_id: str) -> bool:
         """Delete a glossary term"""
-        for glossary in self._glossaries.values():
-            if term_id in glossary.terms:
-                del glossary.terms[term_id]
-                return True
-        return False
+        entry = self._term_index.get(term_id)
+        if not entry:
+            return False
+        entry[0].terms.pop(term_id, None)
+        self._remove_from_index(entry[0], term_id)
+        self._invalidate_combined()
+        return True
 
     def search_terms(self, query: str) -> List[GlossaryTerm]:
-        """Search for glossary terms"""
+        """Search for glossary terms
+
+        Returns terms whose name, definition or one of whose synonyms
+        contains the query (case-insensitive), in glossary order. The
+        inverted index narrows down the candidates: every word of the query
+        must occur inside some indexed word of a matching term, so only the
+        vocabulary is scanned rather than every term's text.
+        """
         query = query.lower()
-        results = []
+        candidate_keys: Optional[Set[Tuple[str, str]]] = None
+        # With nothing to look up (e.g. only punctuation) every term is checked
+        for query_token in sorted(_tokenize(query), key=len, reverse=True):
+            keys: Set[Tuple[str, str]] = set()
+            for token, postings in self._postings.items():
+                if query_token in token:
+                    keys |= postings
+            candidate_keys = keys if candidate_keys is None else candidate_keys & keys
+            if not candidate_keys:
+                return []
 
+        results = []
         for glossary in self._glossaries.values():
-            for term in glossary.terms.values():
-                if (query in term.name.lower() or
-                    query in term.definition.lower() or
-                    any(query in syn.lower() for syn in term.synonyms)):
+            for term_id, term in glossary.terms.items():
+                if candidate_keys is not None and (glossary.id, term_id) not in candidate_keys:
+                    continue
+                if (query in term._name_lc or
+                    query in term._definition_lc or
+                    any(query in syn for syn in term._synonyms_lc)):
                     results.append(term)
 
         return results
@@ -142,17 +216,28 @@ class BusinessGlossariesManager(SearchableAsset):
 
     def load_from_yaml(self, file_path: str):
         """Load glossaries from YAML file"""
-        with open(file_path) as f:
-            data = yaml.safe_load(f)
+        # libyaml parses bytes directly; no text decoding layer needed
+        with open(file_path, 'rb') as f:
+            data = yaml_io.load(f)
             if not data:
                 return
 
+        # Only these two sections are used; drop the rest of the parsed
+        # document before building the objects
+        domains_list = data.pop('domains', None) or []
+        glossaries_list = data.pop('glossaries', None) or []
+        del data
+
         # Clear existing data
         self._glossaries.clear()
         self._domains.clear()
+        self._term_index.clear()
+        self._postings.clear()
+        self._term_tokens.clear()
+        self._invalidate_combined()
 
         # Load domains
-        for domain_data in data.get('domains', []):
+        for domain_data in domains_list:
             domain = Domain(
                 id=domain_data['id'],
                 name=domain_data['name'],
@@ -161,48 +246,13 @@ class BusinessGlossariesManager(SearchableAsset):
             self._domains[domain.id] = domain
 
         # Load glossaries
-        for glossary_data in data.get('glossaries', []):
-            # Convert terms list to dictionary if needed
+        for glossary_data in glossaries_list:
+            # Terms may be given as a list or as a dict keyed by id
             terms_data = glossary_data.get('terms', [])
-            terms_dict = {}
-
-            # Handle both list and dict formats
-            if isinstance(terms_data, list):
-                for term in terms_data:
-                    terms_dict[term['id']] = GlossaryTerm(
-                        id=term['id'],
-                        name=term['name'],
-                        definition=term['definition'],
-                        domain=term['domain'],
-                        abbreviation=term.get('abbreviation'),
-                        synonyms=term.get('synonyms', []),
-                        examples=term.get('examples', []),
-                        tags=term.get('tags', []),
-                        owner=term.get('owner', ''),
-                        status=term.get('status', 'active'),
-                        created_at=datetime.fromisoformat(term['created_at'].replace('Z', '+00:00')),
-                        updated_at=datetime.fromisoformat(term['updated_at'].replace('Z', '+00:00')),
-                        source_glossary_id=glossary_data['id'],
-                        taggedAssets=term.get('taggedAssets', [])
-                    )
-            else:
-                for term_id, term in terms_data.items():
-                    terms_dict[term_id] = GlossaryTerm(
-                        id=term['id'],
-                        name=term['name'],
-                        definition=term['definition'],
-                        domain=term['domain'],
-                        abbreviation=term.get('abbreviation'),
-                        synonyms=term.get('synonyms', []),
-                        examples=term.get('examples', []),
-                        tags=term.get('tags', []),
-                        owner=term.get('owner', ''),
-                        status=term.get('status', 'active'),
-                        created_at=datetime.fromisoformat(term['created_at'].replace('Z', '+00:00')),
-                        updated_at=datetime.fromisoformat(term['updated_at'].replace('Z', '+00:00')),
-                        source_glossary_id=glossary_data['id'],
-                        taggedAssets=term.get('taggedAssets', [])
-                    )
+            if isinstance(terms_data, dict):
+                terms_data = terms_data.values()
+            glossary_id = glossary_data['id']
+            terms_dict = {term['id']: _build_term(term, glossary_id) for term in terms_data}
 
             # Create glossary with converted terms
             glossary = BusinessGlossary(
@@ -216,12 +266,13 @@ class BusinessGlossariesManager(SearchableAsset):
                 tags=glossary_data.get('tags', []),
                 owner=glossary_data.get('owner', ''),
                 status=glossary_data.get('status', 'active'),
-                created_at=datetime.fromisoformat(glossary_data['created_at'].replace('Z', '+00:00')),
-                updated_at=datetime.fromisoformat(glossary_data['updated_at'].replace('Z', '+00:00')),
+                created_at=_parse_iso(glossary_data['created_at']),
+                updated_at=_parse_iso(glossary_data['updated_at']),
                 terms=terms_dict
             )
 
             self._glossaries[glossary.id] = glossary
+            self._index_terms(glossary)
 
         return True
 
@@ -239,6 +290,7 @@ class BusinessGlossariesManager(SearchableAsset):
             tags=tags or []
         )
         self._glossaries[glossary.id] = glossary
+        self._invalidate_combined()
         return glossary
 
     def get_glossary(self, glossary_id: str) -> Optional[BusinessGlossary]:
@@ -251,47 +303,62 @@ class BusinessGlossariesManager(SearchableAsset):
 
     def get_combined_terms(self, org_unit: str) -> List[GlossaryTerm]:
         """Get combined terms for an organizational unit"""
+        cached = self._combined_cache.get(org_unit)
+        if cached is not None:
+            return list(cached)
+
         # Find all relevant glossaries
         relevant_glossaries = self._get_relevant_glossaries(org_unit)
 
-        # Combine terms, with more specific terms overriding general ones
+        # relevant_glossaries is sorted from the broadest scope to the most
+        # specific; the first glossary in that order to define a name keeps it
         combined_terms: Dict[str, GlossaryTerm] = {}
         for glossary in relevant_glossaries:
             for term in glossary.terms.values():
-                # Terms from more specific glossaries override general ones
-                if term.name not in combined_terms:
-                    combined_terms[term.name] = term
+                combined_terms.setdefault(term.name, term)
+        combined = list(combined_terms.values())
 
-        return list(combined_terms.values())
+        self._combined_cache[org_unit] = combined
+        return list(combined)
 
     def _get_relevant_glossaries(self, org_unit: str) -> List[BusinessGlossary]:
         """Get all glossaries relevant to an organizational unit"""
+        cached = self._relevant_cache.get(org_unit)
+        if cached is not None:
+            return list(cached)
+
         relevant_glossaries = []
         visited: Set[str] = set()
 
-        def add_glossary_and_parents(glossary: BusinessGlossary):
+        # Start from the glossaries of this org unit and walk up through
+        # their parents breadth-first
+        queue = deque(g for g in self._glossaries.values() if g.org_unit == org_unit)
+        while queue:
+            glossary = queue.popleft()
             if glossary.id in visited:
-                return
+                continue
             visited.add(glossary.id)
             relevant_glossaries.append(glossary)
 
             # Add parent glossaries
-            for parent_id in glossary.parent_glossary_ids:
-                parent = self._glossaries.get(parent_id)
-                if parent:
-                    add_glossary_and_parents(parent)
-
-        # Find glossaries for this org unit and add them with their parents
-        for glossary in self._glossaries.values():
-            if glossary.org_unit == org_unit:
-                add_glossary_and_parents(glossary)
+            queue.extend(
+                self._glossaries[parent_id]
+                for parent_id in glossary.parent_glossary_ids
+                if parent_id in self._glossaries and parent_id not in visited
+            )
 
         # Sort by scope specificity (company -> division -> department -> team)
         scope_order = {"company": 0, "division": 1, "department": 2, "team": 3}
         relevant_glossaries.sort(key=lambda g: scope_order.get(g.scope, 99))
 
+        self._relevant_cache[org_unit] = list(relevant_glossaries)
         return relevant_glossaries
 
+    def _invalidate_combined(self) -> None:
+        """Forget cached per-org-unit results after a change"""
+        self._combined_cache.clear()
+        self._relevant_cache.clear()
+
     def update_glossary(self, glossary_id: str, updates: dict) -> Optional[BusinessGlossary]:
         """Update a glossary"""
         glossary = self._glossaries.get(glossary_id)
@@ -300,28 +367,83 @@ class BusinessGlossariesManager(SearchableAsset):
 
         for key, value in updates.items():
             if hasattr(glossary, key):
+                if key == 'terms':
+                    self._unindex_terms(glossary)
                 setattr(glossary, key, value)
+                if key == 'terms':
+                    self._index_terms(glossary)
         glossary.updated_at = datetime.utcnow()
+        self._invalidate_combined()
         return glossary
 
     def delete_glossary(self, glossary_id: str) -> bool:
         """Delete a glossary"""
-        return bool(self._glossaries.pop(glossary_id, None))
+        glossary = self._glossaries.pop(glossary_id, None)
+        if not glossary:
+            return False
+        self._unindex_terms(glossary)
+        self._invalidate_combined()
+        return True
+
+    def _index_terms(self, glossary: BusinessGlossary) -> None:
+        """Add all terms of a glossary to the term and search indexes"""
+        for term in glossary.terms.values():
+            self._add_to_index(glossary, term)
+
+    def _unindex_terms(self, glossary: BusinessGlossary) -> None:
+        """Remove all terms of a glossary from the term and search indexes"""
+        for term_id in glossary.terms:
+            self._remove_from_index(glossary, term_id)
+
+    def _add_to_index(self, glossary: BusinessGlossary, term: GlossaryTerm) -> None:
+        """Index a term by id and by the words of its searchable text"""
+        self._term_index[term.id] = (glossary, term)
+        self._index_tokens(glossary, term)
+
+    def _remove_from_index(self, glossary: BusinessGlossary, term_id: str) -> None:
+        """Drop a glossary's term from the term and search indexes"""
+        entry = self._term_index.get(term_id)
+        if entry and entry[0] is glossary:
+            del self._term_index[term_id]
+        key = (glossary.id, term_id)
+        for token in self._term_tokens.pop(key, ()):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.discard(key)
+                if not postings:
+                    del self._postings[token]
+
+    def _index_tokens(self, glossary: BusinessGlossary, term: GlossaryTerm) -> None:
+        """(Re)build the postings of a glossary's term from its current text"""
+        key = (glossary.id, term.id)
+        old_tokens = self._term_tokens.get(key, set())
+        new_tokens = _tokenize(" ".join([term._name_lc, term._definition_lc, *term._synonyms_lc]))
+        for token in old_tokens - new_tokens:
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.discard(key)
+                if not postings:
+                    del self._postings[token]
+        for token in new_tokens - old_tokens:
+            self._postings[token].add(key)
+        self._term_tokens[key] = new_tokens
 
     def save_to_yaml(self, file_path: str) -> bool:
         """Save glossaries to YAML file"""
         try:
-            data = {
-                'glossaries': [
-                    {
-                        **g.to_dict(),
-                        'terms': [t.to_dict() for t in g.terms.values()]
-                    }
-                    for g in self._glossaries.values()
-                ]
-            }
-            with open(file_path, 'w') as f:
-                yaml.safe_dump(data, f, sort_keys=False)
+            with open(file_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                if not self._glossaries:
+                    f.write("glossaries: []\n")
+                    return True
+                # Emit one glossary at a time as an item of the top-level
+                # list, so only a single glossary's dicts exist at once
+                f.write("glossaries:\n")
+                for g in self._glossaries.values():
+                    yaml_io.dump(
+                        [{**g.to_dict(), 'terms': [t.to_dict() for t in g.terms.values()]}],
+                        f,
+                        sort_keys=False
+                    )
             return True
         except Exception as e:
             print(f"Error saving to YAML: {e}")
@@ -329,43 +451,21 @@ class BusinessGlossariesManager(SearchableAsset):
 
     def term_to_dict(self, term: GlossaryTerm) -> dict:
         """Convert a term to dictionary"""
-        return {
-            'id': term.id,
-            'name': term.name,
-            'definition': term.definition,
-            'domain': term.domain,
-            'abbreviation': term.abbreviation,
-            'synonyms': term.synonyms,
-            'examples': term.examples,
-            'tags': term.tags,
-            'owner': term.owner,
-            'status': term.status,
-            'created_at': term.created_at.isoformat(),
-            'updated_at': term.updated_at.isoformat(),
-            'source_glossary_id': term.source_glossary_id
-        }
+        data = dict(zip(_TERM_DICT_KEYS, _term_dict_values(term)))
+        data['created_at'] = term.created_at.isoformat()
+        data['updated_at'] = term.updated_at.isoformat()
+        return data
 
     def glossary_to_dict(self, glossary: BusinessGlossary) -> dict:
         """Convert a glossary to dictionary"""
-        return {
-            'id': glossary.id,
-            'name': glossary.name,
-            'description': glossary.description,
-            'scope': glossary.scope,
-            'org_unit': glossary.org_unit,
-            'domain': glossary.domain,
-            'parent_glossary_ids': glossary.parent_glossary_ids,
-            'tags': glossary.tags,
-            'owner': glossary.owner,
-            'status': glossary.status,
-            'created_at': glossary.created_at.isoformat(),
-            'updated_at': glossary.updated_at.isoformat()
-        }
+        return glossary.to_dict()
 
     def add_term_to_glossary(self, glossary: BusinessGlossary, term: GlossaryTerm) -> None:
         """Add a term to a glossary"""
         term.source_glossary_id = glossary.id
         glossary.terms[term.id] = term
+        self._add_to_index(glossary, term)
+        self._invalidate_combined()
 
     def get_term_from_glossary(self, glossary: BusinessGlossary, term_id: str) -> Optional[GlossaryTerm]:
         """Get a term from a glossary"""
@@ -380,16 +480,28 @@ class BusinessGlossariesManager(SearchableAsset):
             if hasattr(term, key):
                 setattr(term, key, value)
         term.updated_at = datetime.utcnow()
+        if 'name' in updates:
+            # Combined terms are merged by name
+            self._invalidate_combined()
+        if _SEARCHED_FIELDS.intersection(updates):
+            term.refresh_search_fields()
+            self._index_tokens(glossary, term)
         return term
 
     def delete_term_from_glossary(self, glossary: BusinessGlossary, term_id: str) -> bool:
         """Delete a term from a glossary"""
-        return bool(glossary.terms.pop(term_id, None))
+        if not glossary.terms.pop(term_id, None):
+            return False
+        self._invalidate_combined()
+        self._remove_from_index(glossary, term_id)
+        return True
 
     def get_counts(self):
         domain_count = len(self._domains)
         glossary_count = len(self._glossaries)
-        term_count = sum(len(g.terms) for g in self._glossaries.values())
+        # The search index holds one entry per (glossary, term) pair, even
+        # where term ids repeat across glossaries
+        term_count = len(self._term_tokens)
         return {
             "domains": domain_count,
             "glossaries": glossary_count,
@@ -397,10 +509,10 @@ class BusinessGlossariesManager(SearchableAsset):
         }
 
     # --- Implementation of SearchableAsset --- 
-    def get_search_index_items(self) -> List[SearchIndexItem]:
+    def get_search_index_items(self) -> Iterator[SearchIndexItem]:
         """Fetches glossary terms and maps them to SearchIndexItem format."""
         logger.info("Fetching glossary terms for search indexing...")
-        items = []
+        count = 0
         try:
             # Use the existing list_terms method
             terms = self.list_terms()
@@ -410,22 +522,20 @@ class BusinessGlossariesManager(SearchableAsset):
                     logger.warning(f"Skipping term due to missing id or name: {term}")
                     continue
                     
-                items.append(
-                    SearchIndexItem(
-                        id=f"term::{term.id}",
-                        type="glossary-term",
-                        title=term.name,
-                        description=term.definition or "",
-                        # Adjust link format based on frontend routing
-                        link=f"/business-glossaries?termId={term.id}", 
-                        tags=term.tags or []
-                        # Add other fields if needed (e.g., domain, owner)
-                        # domain=term.domain,
-                        # owner=term.owner,
-                    )
+                yield SearchIndexItem(
+                    id=f"term::{term.id}",
+                    type="glossary-term",
+                    title=term.name,
+                    description=term.definition or "",
+                    # Adjust link format based on frontend routing
+                    link=f"/business-glossaries?termId={term.id}", 
+                    tags=term.tags or []
+                    # Add other fields if needed (e.g., domain, owner)
+                    # domain=term.domain,
+                    # owner=term.owner,
                 )
-            logger.info(f"Prepared {len(items)} glossary terms for search index.")
-            return items
+                count += 1
+            logger.info(f"Prepared {count} glossary terms for search index.")
         except Exception as e:
             logger.error(f"Error fetching or mapping glossary terms for search: {e}", exc_info=True)
-            return [] # Return empty list on error
+            return # Stop yielding on error
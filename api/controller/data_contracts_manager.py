@@ -2,7 +2,7 @@ import json
 import logging
 import uuid
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Iterator
 
 import yaml
 
@@ -394,10 +394,10 @@ class DataContractsManager(SearchableAsset):
         }
 
     # --- Implementation of SearchableAsset --- 
-    def get_search_index_items(self) -> List[SearchIndexItem]:
+    def get_search_index_items(self) -> Iterator[SearchIndexItem]:
         """Fetches data contracts and maps them to SearchIndexItem format."""
         logger.info("Fetching data contracts for search indexing...")
-        items = []
+        count = 0
         try:
             # Use the existing list_contracts method
             contracts = self.list_contracts()
@@ -411,19 +411,17 @@ class DataContractsManager(SearchableAsset):
                 # Assuming DataContract has .tags attribute (add if missing)
                 tags = getattr(contract, 'tags', []) 
                     
-                items.append(
-                    SearchIndexItem(
-                        id=f"contract::{contract.id}",
-                        type="data-contract",
-                        title=contract.name, # Use direct .name
-                        description=contract.description or "", # Use direct .description
-                        # Adjust link format based on frontend routing
-                        link=f"/data-contracts/{contract.id}", 
-                        tags=tags
-                    )
+                yield SearchIndexItem(
+                    id=f"contract::{contract.id}",
+                    type="data-contract",
+                    title=contract.name, # Use direct .name
+                    description=contract.description or "", # Use direct .description
+                    # Adjust link format based on frontend routing
+                    link=f"/data-contracts/{contract.id}", 
+                    tags=tags
                 )
-            logger.info(f"Prepared {len(items)} data contracts for search index.")
-            return items
+                count += 1
+            logger.info(f"Prepared {count} data contracts for search index.")
         except Exception as e:
             logger.error(f"Error fetching or mapping data contracts for search: {e}", exc_info=True)
-            return [] # Return empty list on error
+            return # Stop yielding on error
@@ -1,7 +1,7 @@
 import logging
 import uuid
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Union, Iterator
 
 import yaml
 from pydantic import ValidationError, parse_obj_as
@@ -27,6 +27,7 @@ from api.repositories.data_products_repository import data_product_repo
 # Import Search Interfaces
 from api.common.search_interfaces import SearchableAsset, SearchIndexItem
 
+from api.common import yaml_io
 from api.common.logging import setup_logging, get_logger
 setup_logging(level=logging.INFO)
 logger = get_logger(__name__)
@@ -202,7 +203,7 @@ class DataProductsManager(SearchableAsset):
         """Load data products from YAML into the database via the repository."""
         try:
             with open(yaml_path) as file:
-                data = yaml.safe_load(file)
+                data = yaml_io.load(file)
             
             if not isinstance(data, list):
                  logger.error(f"YAML file {yaml_path} should contain a list of products.")
@@ -301,22 +302,23 @@ class DataProductsManager(SearchableAsset):
             return []
 
     # --- Implementation of SearchableAsset --- 
-    def get_search_index_items(self) -> List[SearchIndexItem]:
+    def get_search_index_items(self) -> Iterator[SearchIndexItem]:
         """Fetches data products and maps them to SearchIndexItem format."""
         logger.info("Fetching data products for search indexing...")
-        items = []
+        count = 0
         try:
-            # Fetch all products (adjust limit if needed, but potentially large)
-            # Consider fetching only necessary fields if performance becomes an issue
-            products_api = self.list_products(limit=10000) # Fetch Pydantic models
-            
-            for product in products_api:
-                if not product.id or not product.info or not product.info.title:
-                     logger.warning(f"Skipping product due to missing id or info.title: {product}")
-                     continue
+            # Fetch products one page at a time so only a batch of Pydantic
+            # models is held in memory while items are consumed
+            skip = 0
+            while True:
+                products_api = self.list_products(skip=skip, limit=self.BATCH_SIZE)
+
+                for product in products_api:
+                    if not product.id or not product.info or not product.info.title:
+                         logger.warning(f"Skipping product due to missing id or info.title: {product}")
+                         continue
                      
-                items.append(
-                    SearchIndexItem(
+                    yield SearchIndexItem(
                         id=f"product::{product.id}",
                         type="data-product",
                         title=product.info.title,
@@ -328,9 +330,11 @@ class DataProductsManager(SearchableAsset):
                         # status=product.info.status,
                         # domain=product.info.domain
                     )
-                )
-            logger.info(f"Prepared {len(items)} data products for search index.")
-            return items
+                    count += 1
+                if len(products_api) < self.BATCH_SIZE:
+                    break
+                skip += self.BATCH_SIZE
+            logger.info(f"Prepared {count} data products for search index.")
         except Exception as e:
             logger.error(f"Error fetching or mapping data products for search: {e}", exc_info=True)
-            return [] # Return empty list on error
+            return # Stop yielding on error
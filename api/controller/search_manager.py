@@ -1,5 +1,6 @@
 import logging
-from typing import Any, Dict, List, Optional, Iterable
+from itertools import chain
+from typing import Any, Dict, List, Optional, Iterable, Iterator
 
 # Import Search Interfaces
 from api.common.search_interfaces import SearchableAsset, SearchIndexItem
@@ -31,20 +32,23 @@ class SearchManager:
     def build_index(self):
         """Builds or rebuilds the search index by querying searchable managers."""
         logger.info(f"Building search index from {len(self.searchable_managers)} managers...")
-        new_index: List[SearchIndexItem] = [] # Build into a new list
+        # Stream items from all managers straight into a new list
+        new_index: List[SearchIndexItem] = list(chain.from_iterable(
+            self._items_from(manager) for manager in self.searchable_managers
+        ))
 
-        for manager in self.searchable_managers:
-            manager_name = manager.__class__.__name__
-            try:
-                items = manager.get_search_index_items()
-                new_index.extend(items)
-            except Exception as e:
-                logger.error(f"Failed to get search items from {manager_name}: {e}", exc_info=True)
-        
         # Atomically replace the index
         self.index = new_index
         logger.info(f"Search index build complete. Total items: {len(self.index)}")
 
+    @staticmethod
+    def _items_from(manager: SearchableAsset) -> Iterator[SearchIndexItem]:
+        """Yields a manager's search items, stopping at the first error."""
+        try:
+            yield from manager.get_search_index_items()
+        except Exception as e:
+            logger.error(f"Failed to get search items from {manager.__class__.__name__}: {e}", exc_info=True)
+
     def search(self, query: str) -> List[SearchIndexItem]: # Return type is now List[SearchIndexItem]
         """Performs a case-insensitive prefix search on title, description, tags."""
         if not query:
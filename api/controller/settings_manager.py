@@ -6,14 +6,15 @@ import yaml
 from databricks.sdk import WorkspaceClient
 from databricks.sdk.service import jobs
 
-from api.common.config import Settings
+from api.common.config import Settings, ensure_env_loaded
 from api.models.settings import JobCluster, WorkflowInstallation
 
 
 class SettingsManager:
     def __init__(self, workspace_client: WorkspaceClient):
         self._client = workspace_client
-        self._settings = Settings()
+        ensure_env_loaded()
+        self._settings = Settings.from_env()
         self._available_jobs = [
             'data_contracts',
             'business_glossaries',
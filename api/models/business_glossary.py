@@ -1,5 +1,6 @@
 from dataclasses import dataclass, field
 from datetime import datetime
+from operator import attrgetter
 from typing import Dict, List, Optional
 
 from pydantic import BaseModel
@@ -11,14 +12,33 @@ class TaggedAsset(BaseModel):
     type: str  # 'table' | 'view' | 'column'
     path: str
 
-@dataclass
+@dataclass(slots=True)
 class Domain:
     id: str
     name: str
     description: Optional[str] = None
 
-@dataclass
-class GlossaryTerm:
+# Serialized fields, in output order; read in one call by the attrgetters
+TERM_KEYS = (
+    'id', 'name', 'definition', 'domain', 'abbreviation', 'synonyms', 'examples',
+    'tags', 'owner', 'status', 'created_at', 'updated_at', 'source_glossary_id',
+    'taggedAssets',
+)
+GLOSSARY_KEYS = (
+    'id', 'name', 'description', 'scope', 'org_unit', 'domain', 'parent_glossary_ids',
+    'tags', 'owner', 'status', 'created_at', 'updated_at',
+)
+_term_values = attrgetter(*TERM_KEYS)
+_glossary_values = attrgetter(*GLOSSARY_KEYS)
+
+class _TermSearchFields:
+    """Lowercased copies of the searched term fields, see
+    GlossaryTerm.refresh_search_fields. Plain slots rather than dataclass
+    fields, so they stay out of asdict() and API responses."""
+    __slots__ = ('_name_lc', '_definition_lc', '_synonyms_lc')
+
+@dataclass(slots=True)
+class GlossaryTerm(_TermSearchFields):
     id: str
     name: str
     definition: str
@@ -34,25 +54,23 @@ class GlossaryTerm:
     source_glossary_id: str = ""
     taggedAssets: List[Dict] = field(default_factory=list)
 
+    def __post_init__(self) -> None:
+        self.refresh_search_fields()
+
+    def refresh_search_fields(self) -> None:
+        """Recompute the lowercased search fields; call after changing
+        name, definition or synonyms."""
+        self._name_lc = self.name.lower()
+        self._definition_lc = self.definition.lower()
+        self._synonyms_lc = [syn.lower() for syn in self.synonyms]
+
     def to_dict(self) -> Dict:
-        return {
-            'id': self.id,
-            'name': self.name,
-            'definition': self.definition,
-            'domain': self.domain,
-            'abbreviation': self.abbreviation,
-            'synonyms': self.synonyms,
-            'examples': self.examples,
-            'tags': self.tags,
-            'owner': self.owner,
-            'status': self.status,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat(),
-            'source_glossary_id': self.source_glossary_id,
-            'taggedAssets': self.taggedAssets
-        }
+        data = dict(zip(TERM_KEYS, _term_values(self)))
+        data['created_at'] = self.created_at.isoformat()
+        data['updated_at'] = self.updated_at.isoformat()
+        return data
 
-@dataclass
+@dataclass(slots=True)
 class BusinessGlossary:
     id: str
     name: str
@@ -67,3 +85,10 @@ class BusinessGlossary:
     status: str = "active"
     created_at: datetime = field(default_factory=datetime.utcnow)
     updated_at: datetime = field(default_factory=datetime.utcnow)
+
+    def to_dict(self) -> Dict:
+        """Serialize the glossary without its terms"""
+        data = dict(zip(GLOSSARY_KEYS, _glossary_values(self)))
+        data['created_at'] = self.created_at.isoformat()
+        data['updated_at'] = self.updated_at.isoformat()
+        return data
@@ -191,7 +191,7 @@ class DataProductRepository(CRUDBase[DataProductDb, DataProductCreate, DataProdu
                  selectinload(self.model.inputPorts),
                  selectinload(self.model.outputPorts),
                  selectinload(self.model.tags)
-            ).offset(skip).limit(limit).all()
+            ).order_by(self.model.id).offset(skip).limit(limit).all() # Stable order so pages don't overlap
         except Exception as e:
             logger.error(f"Database error fetching multiple normalized DataProducts: {e}", exc_info=True)
             db.rollback()
@@ -0,0 +1,63 @@
+from pathlib import Path
+
+import pytest
+
+pygit2 = pytest.importorskip("pygit2")
+# Importing the service pulls in the app settings and their dependencies
+git = pytest.importorskip("api.common.git")
+
+BRANCH = "main"
+
+
+def _commit(repo, name: str, content: str, message: str):
+    """Write a file in a work tree and commit it on the test branch."""
+    Path(repo.workdir, name).write_text(content)
+    repo.index.add(name)
+    repo.index.write()
+    tree = repo.index.write_tree()
+    signature = pygit2.Signature("test", "test@example.com")
+    parents = [] if repo.head_is_unborn else [repo.head.target]
+    return repo.create_commit(f"refs/heads/{BRANCH}", signature, signature, message, tree, parents)
+
+
+def _service_for(repo) -> "git.GitService":
+    """A GitService bound to an existing clone, skipping settings and init."""
+    service = object.__new__(git.GitService)
+    service.repo = repo
+    service.branch = BRANCH
+    service._callbacks = None
+    return service
+
+
+def test_pull_updates_shallow_clone(tmp_path):
+    upstream = pygit2.init_repository(str(tmp_path / "upstream"), initial_head=BRANCH)
+    _commit(upstream, "a.yaml", "a: 1\n", "First")
+
+    clone = pygit2.clone_repository(
+        f"file://{tmp_path / 'upstream'}",
+        str(tmp_path / "clone"),
+        checkout_branch=BRANCH,
+        depth=1
+    )
+    new_tip = _commit(upstream, "b.yaml", "b: 2\n", "Second")
+
+    _service_for(clone)._pull()
+
+    assert clone.head.target == new_tip
+    assert clone.head.shorthand == BRANCH
+    assert (tmp_path / "clone" / "b.yaml").read_text() == "b: 2\n"
+
+
+def test_pull_is_noop_when_up_to_date(tmp_path):
+    upstream = pygit2.init_repository(str(tmp_path / "upstream"), initial_head=BRANCH)
+    tip = _commit(upstream, "a.yaml", "a: 1\n", "First")
+    clone = pygit2.clone_repository(
+        f"file://{tmp_path / 'upstream'}",
+        str(tmp_path / "clone"),
+        checkout_branch=BRANCH,
+        depth=1
+    )
+
+    _service_for(clone)._pull()
+
+    assert clone.head.target == tip